@@ -0,0 +1,500 @@
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import game as game_module
+from game import MinesweeperGame
+from headless import HeadlessGame
+
+# Everything else is imported by the benchmarks that use it, so running one
+# does not pay for loading Tk, pygame, multiprocessing and the rest
+
+
+class _GridCell:
+    # The old one-object-per-cell layout, kept here only to compare against
+    def __init__(self):
+        self.is_mine = False
+        self.revealed = False
+        self.flagged = False
+        self.adjacent_mines = 0
+
+
+def _measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    obj = build()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size, elapsed
+
+
+def bench_memory(rows, cols):
+    cells = rows * cols
+    _, grid_bytes, grid_time = _measure(lambda: [[_GridCell() for _ in range(cols)] for _ in range(rows)])
+    _, game_bytes, game_time = _measure(lambda: MinesweeperGame(rows, cols, 0))
+    print(f"Board {rows}x{cols} ({cells} cells)")
+    print(f"  Cell grid : {grid_bytes / cells:8.1f} bytes/cell  {grid_time:.3f}s")
+    print(f"  Flat array: {game_bytes / cells:8.1f} bytes/cell  {game_time:.3f}s")
+
+
+def _seeded_mines(game, density, seed=0):
+    rng = random.Random(seed)
+    for i in rng.sample(range(game.rows * game.cols), int(game.rows * game.cols * density)):
+        game.mine_map[i] = 1
+
+
+def bench_adjacency(rows, cols):
+    game = MinesweeperGame(rows, cols, 0)
+    _seeded_mines(game, 0.2)
+    start = time.perf_counter()
+    game._calculate_adjacent_mines_python()
+    python_time = time.perf_counter() - start
+    expected = bytes(game.adjacent_map)
+    print(f"Adjacency {rows}x{cols}")
+    print(f"  Pure Python: {python_time:.3f}s")
+    if game_module.np is None:
+        print("  NumPy      : not installed")
+        return
+    game.adjacent_map[:] = bytes(rows * cols)
+    start = time.perf_counter()
+    game._calculate_adjacent_mines_numpy()
+    numpy_time = time.perf_counter() - start
+    if bytes(game.adjacent_map) != expected:
+        raise AssertionError("NumPy and pure-Python adjacency counts differ")
+    print(f"  NumPy      : {numpy_time:.3f}s (counts identical)")
+
+
+def _rejection_place(rows, cols, mines, safe_r, safe_c, rng):
+    # The previous randint-and-retry placement, for comparison
+    forbidden = {(safe_r + dr, safe_c + dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1)}
+    positions = set()
+    while len(positions) < mines:
+        r = rng.randint(0, rows - 1)
+        c = rng.randint(0, cols - 1)
+        if (r, c) in forbidden or (r, c) in positions:
+            continue
+        positions.add((r, c))
+    return positions
+
+
+def bench_placement(rows, cols):
+    safe_r, safe_c = rows // 2, cols // 2
+    mines = (rows * cols - 9) * 99 // 100
+    print(f"Mine placement {rows}x{cols}, {mines} mines (99% of free cells)")
+    game = MinesweeperGame(rows, cols, mines, seed=1)
+    start = time.perf_counter()
+    game._place_mines(safe_r, safe_c)
+    print(f"  Sampled  : {time.perf_counter() - start:.3f}s")
+    if sum(game.mine_map) != mines:
+        raise AssertionError("wrong number of mines placed")
+    start = time.perf_counter()
+    _rejection_place(rows, cols, mines, safe_r, safe_c, random.Random(1))
+    print(f"  Rejection: {time.perf_counter() - start:.3f}s")
+    full = MinesweeperGame(rows, cols, rows * cols - 9, seed=1)
+    start = time.perf_counter()
+    full._place_mines(safe_r, safe_c)
+    print(f"  Sampled, every free cell mined: {time.perf_counter() - start:.3f}s")
+
+
+def bench_solver(rows, cols, games=200):
+    # Plays whole Expert games with the solver; --rows/--cols do not apply
+    from solver import Solver
+    solve_time = 0.0
+    wins = 0
+    for seed in range(games):
+        headless = HeadlessGame("Expert", seed=seed)
+        solver = Solver(headless.game)
+        while headless.state == "playing":
+            start = time.perf_counter()
+            _, r, c, _ = solver.next_move()
+            solve_time += time.perf_counter() - start
+            changed = headless.reveal(r, c)
+            start = time.perf_counter()
+            solver.update(changed)
+            solve_time += time.perf_counter() - start
+        wins += headless.state == "won"
+    print(f"Solver on {games} Expert boards")
+    print(f"  {1000 * solve_time / games:.2f} ms of solver time per game, {100 * wins / games:.1f}% won")
+
+
+def bench_probability(rows, cols, games=50):
+    # Exact probabilities at every guess of solver-played Expert games
+    from probability import ProbabilityEngine
+    calls = 0
+    elapsed = 0.0
+    hits = misses = 0
+    for seed in range(games):
+        headless = HeadlessGame("Expert", seed=seed)
+        engine = ProbabilityEngine(headless.game)
+        while headless.state == "playing":
+            move = engine.solver.next_move()
+            if move[3] > 0.0:
+                start = time.perf_counter()
+                move = engine.best_move()
+                elapsed += time.perf_counter() - start
+                calls += 1
+            engine.update(headless.reveal(move[1], move[2]))
+        hits += engine.hits
+        misses += engine.misses
+    print(f"Exact probabilities on {games} Expert games")
+    print(f"  {calls} guesses, {1000 * elapsed / max(calls, 1):.2f} ms each, "
+          f"component cache {hits} hits / {misses} misses")
+
+
+def _deque_flood(game, r, c):
+    # The previous _dfs_reveal: tuple stack with duplicate pushes
+    from collections import deque
+    rows, cols = game.rows, game.cols
+    revealed_map, flagged_map, mine_map, adjacent_map = (
+        game.revealed_map, game.flagged_map, game.mine_map, game.adjacent_map)
+    stack = deque([(r, c)])
+    while stack:
+        x, y = stack.pop()
+        i = x * cols + y
+        if revealed_map[i] or flagged_map[i]:
+            continue
+        revealed_map[i] = 1
+        if adjacent_map[i] == 0:
+            for dx in [-1, 0, 1]:
+                for dy in [-1, 0, 1]:
+                    nx, ny = x + dx, y + dy
+                    if 0 <= nx < rows and 0 <= ny < cols:
+                        j = nx * cols + ny
+                        if not revealed_map[j] and not mine_map[j]:
+                            stack.append((nx, ny))
+
+
+def bench_flood(rows, cols):
+    rows, cols = min(rows, 1000), min(cols, 1000)
+    game = MinesweeperGame(rows, cols, 0)
+    _seeded_mines(game, 0.01)
+    game._calculate_adjacent_mines()
+    start_cell = next(i for i in range(rows * cols) if not game.mine_map[i] and not game.adjacent_map[i])
+    r, c = divmod(start_cell, cols)
+    start = time.perf_counter()
+    _deque_flood(game, r, c)
+    old_time = time.perf_counter() - start
+    expected = bytes(game.revealed_map)
+    game.revealed_map[:] = bytes(rows * cols)
+    start = time.perf_counter()
+    opened = game._dfs_reveal(r, c)
+    new_time = time.perf_counter() - start
+    if bytes(game.revealed_map) != expected:
+        raise AssertionError("flood fills disagree")
+    print(f"Flood fill {rows}x{cols}, 1% mines, {len(opened)} cells opened")
+    print(f"  Tuple deque : {old_time:.3f}s")
+    print(f"  Index tables: {new_time:.3f}s")
+
+
+def _json_save(game, path):
+    # A naive per-cell JSON dump, the obvious alternative to savefile.py
+    cols = game.cols
+    board = [[{"mine": game.mine_map[r * cols + c], "revealed": game.revealed_map[r * cols + c],
+               "flagged": game.flagged_map[r * cols + c], "adjacent": game.adjacent_map[r * cols + c]}
+              for c in range(cols)] for r in range(game.rows)]
+    with open(path, "w") as f:
+        json.dump({"rows": game.rows, "cols": cols, "mines": game.mines, "seed": game.seed, "board": board}, f)
+
+
+def bench_savefile(rows, cols):
+    from savefile import load_game, open_save, save_game
+    rows, cols = min(rows, 1000), min(cols, 1000)
+    game = MinesweeperGame(rows, cols, rows * cols // 5, seed=7)
+    game.reveal_cell(rows // 2, cols // 2)
+    for i in range(0, rows * cols, 97):
+        if not game.revealed_map[i]:
+            game.flagged_map[i] = 1
+    game.flag_count = sum(game.flagged_map)
+    with tempfile.TemporaryDirectory() as tmp:
+        binary_path = os.path.join(tmp, "game.msw")
+        json_path = os.path.join(tmp, "game.json")
+        start = time.perf_counter()
+        save_game(game, binary_path, elapsed=12.5, score=340, level="Custom")
+        save_time = time.perf_counter() - start
+        start = time.perf_counter()
+        saved = load_game(binary_path)
+        load_time = time.perf_counter() - start
+        start = time.perf_counter()
+        with open_save(binary_path) as mapped:
+            corner = mapped.board[rows - 1][cols - 1].adjacent_mines
+            open_time = time.perf_counter() - start
+            for i in range(0, rows * cols, 101):
+                r, c = divmod(i, cols)
+                if (mapped.board[r][c].is_mine, mapped.board[r][c].adjacent_mines) != (
+                        game.board[r][c].is_mine, game.board[r][c].adjacent_mines):
+                    raise AssertionError("mapped save disagrees with the game")
+        loaded = saved.game
+        for plane in ("mine_map", "revealed_map", "flagged_map", "adjacent_map"):
+            if bytes(getattr(loaded, plane)) != bytes(getattr(game, plane)):
+                raise AssertionError(f"round trip changed {plane}")
+        if ((loaded.safe_left, loaded.flag_count, loaded.seed, saved.elapsed, saved.score, saved.level)
+                != (game.safe_left, game.flag_count, game.seed, 12.5, 340, "Custom")):
+            raise AssertionError("round trip changed the game state")
+        if corner != game.adjacent_map[rows * cols - 1]:
+            raise AssertionError("mapped adjacency disagrees with the game")
+        start = time.perf_counter()
+        _json_save(game, json_path)
+        json_save_time = time.perf_counter() - start
+        start = time.perf_counter()
+        with open(json_path) as f:
+            json.load(f)
+        json_load_time = time.perf_counter() - start
+        binary_size = os.path.getsize(binary_path)
+        json_size = os.path.getsize(json_path)
+    print(f"Save file {rows}x{cols} (round trip identical)")
+    print(f"  Binary: {binary_size / 1024:10.1f} KiB  save {save_time:.3f}s  load {load_time:.3f}s  "
+          f"mmap open {1000 * open_time:.2f} ms")
+    print(f"  JSON  : {json_size / 1024:10.1f} KiB  save {json_save_time:.3f}s  load {json_load_time:.3f}s")
+
+
+def bench_replay(rows, cols, games=200):
+    # Records solver-played Expert games, then replays the log; --rows/--cols do not apply
+    from replay import REVEAL, MoveLog, Replayer
+    from solver import Solver
+    log = MoveLog()
+    finals = []
+    for seed in range(games):
+        headless = HeadlessGame("Expert", seed=seed)
+        solver = Solver(headless.game)
+        log.reset(headless.game, "Expert")
+        while headless.state == "playing":
+            _, r, c, _ = solver.next_move()
+            log.record(REVEAL, r * headless.game.cols + c)
+            solver.update(headless.reveal(r, c))
+        finals.append((len(log), headless.snapshot()))
+    log = MoveLog.from_bytes(log.to_bytes())
+    replayer = Replayer(log)
+    # Seeking game by game replays every move once (a plain seek to the end
+    # would start at the last reset)
+    forward_time = 0.0
+    for position, snapshot in finals:
+        start = time.perf_counter()
+        replayer.seek(position)
+        forward_time += time.perf_counter() - start
+        if replayer.headless.snapshot() != snapshot:
+            raise AssertionError(f"replay differs from the recorded game at move {position}")
+    rng = random.Random(0)
+    targets = [rng.randrange(len(log) + 1) for _ in range(1000)]
+    start = time.perf_counter()
+    for n in targets:
+        replayer.seek(n)
+    seek_time = time.perf_counter() - start
+    print(f"Replay of {games} Expert games, {len(log)} moves, {len(log.to_bytes()) / 1024:.1f} KiB log")
+    print(f"  Fast-forward: {len(log) / forward_time:.0f} moves/s (every game identical)")
+    print(f"  Random seek : {1000 * seek_time / len(targets):.2f} ms with a snapshot every "
+          f"{replayer.interval} moves")
+
+
+def bench_chunked(rows, cols):
+    # First click on an eager board against lazy chunked boards of growing size
+    from chunked import ChunkedGame
+    density = 0.17
+    print(f"First click, {density:.0%} mines")
+
+    def first_click(build):
+        def run():
+            game = build()
+            game.reveal_cell(rows // 2, cols // 2)
+            return game
+        # Timed without tracemalloc, which slows allocation-heavy code down a lot
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        game, size, _ = _measure(run)
+        return game, size, elapsed
+
+    game, size, elapsed = first_click(lambda: MinesweeperGame(rows, cols, int(rows * cols * density), seed=3))
+    print(f"  Eager   {rows}x{cols}: {elapsed:.3f}s  {size / 2 ** 20:8.1f} MiB")
+    for label, board_rows, board_cols in ((f"{rows}x{cols}", rows, cols),
+                                          ("1000000x1000000", 10 ** 6, 10 ** 6), ("unbounded", None, None)):
+        game, size, elapsed = first_click(lambda: ChunkedGame(seed=3, density=density, rows=board_rows, cols=board_cols))
+        print(f"  Chunked {label}: {elapsed:.3f}s  {size / 2 ** 20:8.1f} MiB  "
+              f"{len(game.chunks)} chunks materialized, {len(game.layouts)} layouts")
+
+
+_LEGACY_AUDIO = """
+import os, time
+start = time.perf_counter()
+import pygame
+try:
+    pygame.mixer.init()
+    for name in ("click", "explosion", "win"):
+        pygame.mixer.Sound(os.path.join("src", name + ".wav"))
+    pygame.mixer.music.load(os.path.join("src", "background.mp3"))
+except pygame.error:
+    pass
+print(time.perf_counter() - start)
+"""
+
+_MANAGER_AUDIO = """
+import time
+start = time.perf_counter()
+from sound import SoundManager
+manager = SoundManager(".", enabled={enabled})
+returned = time.perf_counter() - start
+manager.ready.wait()
+print(returned, time.perf_counter() - start, manager.backend)
+"""
+
+
+def bench_sound(rows, cols, clicks=2000, spaced=40):
+    # Startup in fresh interpreters (pygame import included), then play() cost
+    from sound import SoundManager
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+
+    def run(code):
+        out = subprocess.run([sys.executable, "-c", code], cwd=here, env=env,
+                             capture_output=True, text=True, check=True).stdout
+        return out.split()[-3:] if "manager" in code else out.split()[-1:]
+
+    print("Audio startup (time before the window can open)")
+    legacy, = run(_LEGACY_AUDIO)
+    print(f"  Import-time init      : {1000 * float(legacy):7.1f} ms")
+    for enabled in (True, False):
+        returned, ready, backend = run(_MANAGER_AUDIO.format(enabled=enabled))
+        print(f"  SoundManager {'on ' if enabled else 'off'}     : {1000 * float(returned):7.1f} ms "
+              f"(audio ready after {1000 * float(ready):.1f} ms, {backend})")
+    print(f"Click latency: {clicks} back-to-back play() calls, then {spaced} spaced ones")
+    for enabled in (True, False):
+        manager = SoundManager(here, enabled=enabled, music=False)
+        manager.ready.wait()
+        start = time.perf_counter()
+        for _ in range(clicks):
+            manager.play("click")
+        burst = time.perf_counter() - start
+        queued = 0.0
+        for _ in range(spaced):
+            time.sleep(manager.min_interval)
+            start = time.perf_counter()
+            manager.play("click")
+            queued += time.perf_counter() - start
+        manager.close()
+        print(f"  SoundManager {'on ' if enabled else 'off'}     : {1e6 * burst / clicks:6.2f} us burst, "
+              f"{1e6 * queued / spaced:6.2f} us spaced ({manager.backend}, {manager.played} played, "
+              f"{manager.dropped} coalesced or dropped)")
+
+
+def bench_noguess(rows, cols, boards=20):
+    # Generation cost per preset, then pulling boards from a filled pool; --rows/--cols do not apply
+    from noguess import BoardPool, generate
+    print("No-guess generation (centre click, one process)")
+    for level in ("Easy", "Medium", "Hard"):
+        level_rows, level_cols, mines, _ = game_module.LEVELS[level]
+        start = time.perf_counter()
+        for seed in range(boards):
+            if generate(level_rows, level_cols, mines, level_rows // 2, level_cols // 2, seed * 1000) is None:
+                raise AssertionError("no no-guess board found")
+        print(f"  {level:6s}: {1000 * (time.perf_counter() - start) / boards:7.1f} ms per board")
+    level_rows, level_cols, mines, _ = game_module.LEVELS["Expert"]
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = BoardPool([(level_rows, level_cols, mines)], os.path.join(tmp, "noguess.db"),
+                         memory_per_class=1, disk_per_class=1)
+        start = time.perf_counter()
+        pool.fill()
+        fill_time = time.perf_counter() - start
+        takes = []
+        for _ in range(2):
+            for cell in sorted(pool.symmetries[(level_rows, level_cols)].canonical_cells()):
+                start = time.perf_counter()
+                if pool.take(level_rows, level_cols, mines, *cell) is None:
+                    raise AssertionError("filled pool had no board")
+                takes.append(time.perf_counter() - start)
+    memory, disk = takes[:len(takes) // 2], takes[len(takes) // 2:]
+    print(f"Expert pool, {len(memory)} position classes: filled in {fill_time:.1f}s with {pool.workers} workers")
+    print(f"  take() from memory: {1e6 * sum(memory) / len(memory):7.1f} us")
+    print(f"  take() from disk  : {1e6 * sum(disk) / len(disk):7.1f} us")
+
+
+def _click_app(stats):
+    # MinesweeperApp without a window: the widgets it touches on a click are stand-ins
+    import main as main_module
+    from sound import SoundManager
+    from tkstub import FakeWidget
+    app = object.__new__(main_module.MinesweeperApp)
+    app.__dict__.update(game=None, board_pool=None, stats=stats, recording=False, last_reveal=None,
+                        score=0, tk_calls=0, score_label=FakeWidget(), info_label=FakeWidget(),
+                        sound=SoundManager(os.path.dirname(os.path.abspath(__file__)), enabled=False))
+    app.board_view = main_module.RENDERERS["canvas"](app, FakeWidget())
+    return app
+
+
+def bench_instrument(rows, cols, games=50):
+    # on_left_click on Expert boards with instrumentation off and on; --rows/--cols do not apply
+    import instrument
+    import main as main_module
+    from tkstub import FAKE_TK
+    level_rows, level_cols, mines, _ = game_module.LEVELS["Expert"]
+    real_tk = main_module.tk
+    main_module.tk = FAKE_TK
+    try:
+        print(f"on_left_click, {games} Expert games clicked up to the last safe cell (stand-in Tk)")
+        for label, stats in (("off", None), ("on ", instrument.Stats())):
+            app = _click_app(stats)
+            clicks = 0
+            elapsed = 0.0
+            for seed in range(games):
+                app.game = game = MinesweeperGame(level_rows, level_cols, mines, seed=seed)
+                app.board_view.build(level_rows, level_cols)
+                game._place_mines(level_rows // 2, level_cols // 2)
+                order = [i for i in range(level_rows * level_cols) if not game.mine_map[i]]
+                random.Random(seed).shuffle(order)
+                for i in order:
+                    if game.safe_left == 1:
+                        break
+                    if game.revealed_map[i]:
+                        continue
+                    start = time.perf_counter()
+                    app.on_left_click(*divmod(i, level_cols))
+                    elapsed += time.perf_counter() - start
+                    clicks += 1
+            print(f"  instrumentation {label}: {1e6 * elapsed / clicks:7.2f} us per click ({clicks} clicks)")
+        reveal = stats.summary()["series"]["reveal_ms"]
+        print(f"  recorded reveal_ms p50 {reveal['p50']:.3f} p99 {reveal['p99']:.3f}")
+    finally:
+        main_module.tk = real_tk
+    ring = instrument.Ring()
+    start = time.perf_counter()
+    for i in range(100000):
+        ring.add(i)
+    print(f"Ring.add: {1e9 * (time.perf_counter() - start) / 100000:.0f} ns per sample")
+
+
+BENCHMARKS = {
+    "memory": bench_memory,
+    "adjacency": bench_adjacency,
+    "placement": bench_placement,
+    "solver": bench_solver,
+    "probability": bench_probability,
+    "flood": bench_flood,
+    "savefile": bench_savefile,
+    "replay": bench_replay,
+    "chunked": bench_chunked,
+    "sound": bench_sound,
+    "noguess": bench_noguess,
+    "instrument": bench_instrument,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Minesweeper benchmarks")
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run ({', '.join(BENCHMARKS)}), default all")
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--cols", type=int, default=2000)
+    args = parser.parse_args()
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    for name in args.names or BENCHMARKS:
+        BENCHMARKS[name](args.rows, args.cols)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+# benchsuite.py
+# Reproducible timings for the game core, rendering and leaderboard I/O.
+#
+# Every board is seeded, every case is timed as the best of several runs with
+# the garbage collector off, and results go to JSON. --compare checks a run
+# against a saved baseline and exits with status 1 if any case got slower by
+# more than --threshold.
+#
+#   python benchsuite.py --out baseline.json
+#   python benchsuite.py --out new.json --compare baseline.json
+#
+# Fast cases are sampled until they have run for MIN_TOTAL_TIME. Compare runs
+# from the same machine with nothing else busy; on a shared or throttled
+# machine raise --threshold.
+#
+# benchmark.py keeps the one-off before/after comparisons; this file is what
+# to run before and after a change.
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import game as game_module
+import main
+import utils
+from cell import Cell
+from game import LEVELS, MinesweeperGame
+from leaderboard import get_store
+from tkstub import FAKE_TK, FakeWidget
+
+SEED = 12345
+
+# name -> (rows, cols, mines); the custom sizes keep the Expert density
+CONFIGS = {name: LEVELS[name][:3] for name in ("Easy", "Medium", "Hard", "Expert")}
+CONFIGS["Large"] = (500, 500, 500 * 500 * 99 // 576)
+CONFIGS["Huge"] = (2000, 2000, 2000 * 2000 * 99 // 576)
+# Few mines: the first click floods most of the board
+CONFIGS["Sparse"] = (500, 500, 2500)
+
+# Object-per-cell cases stop at this many cells (a Cell grid of Huge needs gigabytes)
+OBJECT_CELL_LIMIT = 500 * 500
+
+# Fast cases keep sampling until they have run this long in total
+MIN_TOTAL_TIME = 0.1
+MAX_SAMPLES = 2000
+
+
+def _time(run, setup=None, repeat=5):
+    # Best of at least `repeat` runs (more for fast cases, so the minimum is
+    # stable); setup() is untimed and its result is passed to run()
+    best = None
+    total = 0.0
+    samples = 0
+    enabled = gc.isenabled()
+    try:
+        while samples < repeat or (total < MIN_TOTAL_TIME and samples < MAX_SAMPLES):
+            state = setup() if setup else None
+            gc.disable()
+            start = time.perf_counter()
+            run(state)
+            elapsed = time.perf_counter() - start
+            if enabled:
+                gc.enable()
+            samples += 1
+            total += elapsed
+            if best is None or elapsed < best:
+                best = elapsed
+    finally:
+        if enabled:
+            gc.enable()
+    return best
+
+
+def _placed_game(rows, cols, mines):
+    game = MinesweeperGame(rows, cols, mines, seed=SEED)
+    game._place_mines(rows // 2, cols // 2)
+    return game
+
+
+def _cell_grid(game):
+    rows, cols = game.rows, game.cols
+    board = [[Cell(r, c) for c in range(cols)] for r in range(rows)]
+    for i in range(rows * cols):
+        cell = board[i // cols][i % cols]
+        cell.is_mine = bool(game.mine_map[i])
+        cell.adjacent_mines = game.adjacent_map[i]
+    return board
+
+
+class _App:
+    # What the renderers and MinesweeperApp.update_buttons need from the app
+    get_color = main.MinesweeperApp.get_color
+    update_buttons = main.MinesweeperApp.update_buttons
+
+    def __init__(self, game, renderer):
+        self.game = game
+        self.tk_calls = 0
+        self.stats = None
+        self.board_view = main.RENDERERS[renderer](self, FakeWidget())
+        self.board_view.build(game.rows, game.cols)
+
+    def on_left_click(self, x, y):
+        pass
+
+    on_right_click = on_chord = on_left_click
+
+
+def _repaint_case(rows, cols, mines, renderer, repeat):
+    # Repaint of every cell a first-click flood opened, through update_buttons
+    real_tk = main.tk
+    main.tk = FAKE_TK
+    try:
+        game = _placed_game(rows, cols, mines)
+        changed = set(game._dfs_reveal(rows // 2, cols // 2))
+        app = _App(game, renderer)
+        return _time(lambda _: app.update_buttons(changed), repeat=repeat)
+    finally:
+        main.tk = real_tk
+
+
+def core_cases(name, repeat):
+    rows, cols, mines = CONFIGS[name]
+    r0, c0 = rows // 2, cols // 2
+    cases = {}
+
+    cases["place_mines"] = _time(lambda game: game._place_mines(r0, c0),
+                                 lambda: MinesweeperGame(rows, cols, mines, seed=SEED), repeat)
+    placed = _placed_game(rows, cols, mines)
+    cases["adjacent_mines"] = _time(lambda _: placed._calculate_adjacent_mines(), repeat=repeat)
+
+    def fresh():
+        placed.revealed_map[:] = bytes(rows * cols)
+        return placed
+    cases["dfs_reveal"] = _time(lambda game: game._dfs_reveal(r0, c0), fresh, repeat)
+
+    placed.safe_left = placed._count_safe_left()
+    calls = 1000
+    cases["check_win"] = _time(lambda _: [placed._check_win() for _ in range(calls)], repeat=repeat) / calls
+    placed.debug = True
+    cases["check_win_debug_scan"] = _time(lambda _: placed._check_win(), repeat=repeat)
+    placed.debug = False
+
+    if rows * cols <= OBJECT_CELL_LIMIT:
+        cases["utils_dfs_reveal"] = _time(lambda board: utils.dfs_reveal(board, r0, c0, rows, cols),
+                                          lambda: _cell_grid(placed), repeat)
+        for renderer in main.RENDERERS:
+            cases[f"repaint_{renderer}"] = _repaint_case(rows, cols, mines, renderer, repeat)
+    return cases
+
+
+def _scores(n):
+    levels = list(LEVELS)
+    return [{"name": f"player{i}", "score": i * 7919 % 1000, "level": levels[i % len(levels)],
+             "duration": i * 104729 % 600} for i in range(n)]
+
+
+def leaderboard_cases(repeat, history=10000):
+    # Reads run against a fixed history; add_score writes to its own database
+    cases = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        read_path = os.path.join(tmp, "read.db")
+        get_store(read_path).replace_all(_scores(history))
+        cases["load_leaderboard"] = _time(lambda _: utils.load_leaderboard(read_path), repeat=repeat)
+        cases["load_leaderboard_level"] = _time(lambda _: utils.load_leaderboard(read_path, "Expert"),
+                                                repeat=repeat)
+        write_path = os.path.join(tmp, "write.db")
+        get_store(write_path)
+        entries = iter(_scores(MAX_SAMPLES + repeat))
+
+        def add(_):
+            entry = next(entries)
+            utils.add_score(entry["name"], entry["score"], entry["level"], entry["duration"], write_path)
+        cases["add_score"] = _time(add, repeat=repeat)
+    return cases
+
+
+def run(configs, repeat, include_leaderboard=True, progress=True):
+    results = {}
+    for name in configs:
+        # Fewer runs on the big boards; their times are long enough to be stable
+        rows, cols, _ = CONFIGS[name]
+        runs = repeat if rows * cols <= 250000 else max(1, min(repeat, 3))
+        for case, seconds in core_cases(name, runs).items():
+            results[f"{name}/{case}"] = seconds
+        if progress:
+            print(f"  {name} done", file=sys.stderr)
+    if include_leaderboard:
+        for case, seconds in leaderboard_cases(repeat).items():
+            results[f"leaderboard/{case}"] = seconds
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": game_module.np is not None,
+            "seed": SEED,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def _format_seconds(seconds):
+    if seconds >= 1:
+        return f"{seconds:8.3f} s "
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:8.3f} ms"
+    return f"{seconds * 1e6:8.3f} us"
+
+
+def print_results(report):
+    for key, seconds in report["results"].items():
+        print(f"  {key:36s} {_format_seconds(seconds)}")
+
+
+def compare(baseline, report, threshold):
+    # Returns the keys that got slower than baseline by more than threshold
+    regressions = []
+    old, new = baseline["results"], report["results"]
+    for meta in ("python", "numpy", "platform"):
+        if baseline["meta"].get(meta) != report["meta"].get(meta):
+            print(f"  note: {meta} differs ({baseline['meta'].get(meta)} -> {report['meta'].get(meta)})")
+    for key in sorted(set(old) | set(new)):
+        if key not in new:
+            print(f"  {key:36s} missing from this run")
+            continue
+        if key not in old:
+            print(f"  {key:36s} {_format_seconds(new[key])}  (new)")
+            continue
+        ratio = new[key] / old[key] if old[key] else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "REGRESSION"
+            regressions.append(key)
+        elif ratio < 1 - threshold:
+            flag = "faster"
+        print(f"  {key:36s} {_format_seconds(old[key])} -> {_format_seconds(new[key])}  x{ratio:5.2f}  {flag}")
+    return regressions
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Minesweeper benchmark suite")
+    parser.add_argument("--configs", nargs="*", default=list(CONFIGS),
+                        help=f"board configurations ({', '.join(CONFIGS)}), default all")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case; the best one counts")
+    parser.add_argument("--no-leaderboard", action="store_true", help="skip the leaderboard I/O cases")
+    parser.add_argument("--out", help="write the results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="relative slowdown reported as a regression (default 0.15)")
+    args = parser.parse_args()
+    unknown = [name for name in args.configs if name not in CONFIGS]
+    if unknown:
+        parser.error(f"unknown configuration(s): {', '.join(unknown)}")
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    report = run(args.configs, args.repeat, include_leaderboard=not args.no_leaderboard)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    if baseline is None:
+        print_results(report)
+        return
+    print(f"Compared with {args.compare} ({baseline['meta'].get('created')}), threshold {args.threshold:.0%}")
+    regressions = compare(baseline, report, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+    print("No regressions")
+
+
+if __name__ == "__main__":
+    main_cli()
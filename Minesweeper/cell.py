@@ -1,4 +1,6 @@
 class Cell:
+    __slots__ = ("x", "y", "is_mine", "adjacent_mines", "revealed", "flagged")
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -0,0 +1,328 @@
+# chunked.py
+# Lazy board for huge and unbounded minefields.
+#
+# The board is cut into chunk x chunk squares. A chunk's mine layout comes
+# from its own RNG, seeded from the game seed and the chunk coordinates
+# (random.Random hashes the string with SHA-512), so any chunk can be rebuilt
+# on its own and in any order. Every chunk holds round(density * cells) mines,
+# which makes the total known on bounded boards without generating them all.
+#
+# Layouts are generated when a materialized chunk needs its neighbours' mines
+# for the border counts; a chunk is materialized (revealed/flagged/adjacent
+# planes) only when a reveal or a flood reaches it. Memory and the cost of a
+# click follow the explored area, not the board size.
+#
+# Cells are addressed by (r, c); on an unbounded board r and c may be any
+# integer, negative included. Square topology only.
+
+import random
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the pure-Python path is used without it
+    np = None
+
+CHUNK = 64
+# Below roughly this density zero cells percolate and a single flood on an
+# unbounded board would never stop
+MIN_UNBOUNDED_DENSITY = 0.15
+
+_NEIGHBOURS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
+class Chunk:
+    __slots__ = ("mines", "revealed", "flagged", "adjacent")
+
+    def __init__(self, mines, adjacent):
+        self.mines = mines
+        self.adjacent = adjacent
+        self.revealed = bytearray(len(mines))
+        self.flagged = bytearray(len(mines))
+
+
+class ChunkedGame:
+    def __init__(self, seed=None, density=0.17, rows=None, cols=None, chunk=CHUNK):
+        if (rows is None) != (cols is None):
+            raise ValueError("Give both rows and cols for a bounded board, or neither")
+        if not 0 <= density < 1:
+            raise ValueError(f"Mine density must be in [0, 1), got {density}")
+        if rows is None and density < MIN_UNBOUNDED_DENSITY:
+            raise ValueError(f"Unbounded boards need a mine density of at least {MIN_UNBOUNDED_DENSITY}")
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.seed = seed
+        self.density = density
+        self.rows = rows
+        self.cols = cols
+        self.chunk = chunk
+        self.layouts = {}   # (cr, cc) -> mine bytearray, chunk * chunk
+        self.chunks = {}    # (cr, cc) -> Chunk
+        self.safe_zone = frozenset()
+        self.mines_placed = False
+        self.revealed_count = 0
+        self.flag_count = 0
+        self.mines = self._total_mines() if rows is not None else None
+        self.changed = set()
+        self.is_game_over = False
+        self.is_win = False
+
+    # ---- layout ----
+
+    def _chunk_mines(self, height, width):
+        return round(self.density * height * width)
+
+    def _chunk_size(self, cr, cc):
+        # Rows and columns of the chunk that lie on the board
+        size = self.chunk
+        if self.rows is None:
+            return size, size
+        if cr < 0 or cc < 0:
+            return 0, 0
+        return min(size, self.rows - cr * size), min(size, self.cols - cc * size)
+
+    def _total_mines(self):
+        size = self.chunk
+        total = 0
+        full_r, rest_r = divmod(self.rows, size)
+        full_c, rest_c = divmod(self.cols, size)
+        for count_r, height in ((full_r, size), (1 if rest_r else 0, rest_r)):
+            for count_c, width in ((full_c, size), (1 if rest_c else 0, rest_c)):
+                total += count_r * count_c * self._chunk_mines(height, width)
+        return total
+
+    def _in_bounds(self, r, c):
+        return self.rows is None or (0 <= r < self.rows and 0 <= c < self.cols)
+
+    def _layout(self, cr, cc):
+        layout = self.layouts.get((cr, cc))
+        if layout is not None:
+            return layout
+        size = self.chunk
+        layout = bytearray(size * size)
+        height, width = self._chunk_size(cr, cc)
+        if height > 0 and width > 0:
+            rng = random.Random(f"{self.seed}:{cr}:{cc}")
+            for k in rng.sample(range(height * width), self._chunk_mines(height, width)):
+                lr, lc = divmod(k, width)
+                layout[lr * size + lc] = 1
+            # The first click and its neighbours never hold a mine
+            for r, c in self.safe_zone:
+                if r // size == cr and c // size == cc:
+                    layout[(r % size) * size + c % size] = 0
+        self.layouts[(cr, cc)] = layout
+        return layout
+
+    def _materialize(self, cr, cc):
+        size = self.chunk
+        mines = self._layout(cr, cc)
+        # Mines of this chunk plus a one-cell border from the eight around it
+        padded = bytearray((size + 2) * (size + 2))
+        width = size + 2
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                source = mines if dr == dc == 0 else self._layout(cr + dr, cc + dc)
+                # Only the edge of a neighbouring chunk that touches this one
+                local_rows = range(size) if dr == 0 else [size - 1] if dr < 0 else [0]
+                local_cols = range(size) if dc == 0 else [size - 1] if dc < 0 else [0]
+                for lr in local_rows:
+                    pr = lr + 1 + dr * size
+                    if dc == 0:
+                        start = pr * width + 1
+                        padded[start:start + size] = source[lr * size:(lr + 1) * size]
+                    else:
+                        for lc in local_cols:
+                            padded[pr * width + lc + 1 + dc * size] = source[lr * size + lc]
+        adjacent = self._count(padded, mines)
+        chunk = self.chunks[(cr, cc)] = Chunk(mines, adjacent)
+        return chunk
+
+    def _count(self, padded, mines):
+        size = self.chunk
+        width = size + 2
+        if np is not None:
+            grid = np.frombuffer(padded, dtype=np.uint8).reshape(width, width)
+            counts = np.zeros((size, size), dtype=np.uint8)
+            for dr in range(3):
+                for dc in range(3):
+                    if dr != 1 or dc != 1:
+                        counts += grid[dr:dr + size, dc:dc + size]
+            counts[np.frombuffer(mines, dtype=np.uint8).reshape(size, size) != 0] = 0
+            return bytearray(counts.tobytes())
+        adjacent = bytearray(size * size)
+        deltas = [dr * width + dc for dr, dc in _NEIGHBOURS]
+        for lr in range(size):
+            base = (lr + 1) * width + 1
+            for lc in range(size):
+                if not mines[lr * size + lc]:
+                    p = base + lc
+                    adjacent[lr * size + lc] = sum(padded[p + d] for d in deltas)
+        return adjacent
+
+    def _chunk(self, r, c):
+        # (chunk, local index) of a cell, materializing the chunk if needed
+        size = self.chunk
+        key = (r // size, c // size)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self._materialize(*key)
+        return chunk, (r % size) * size + c % size
+
+    def _place_mines(self, r, c):
+        size = self.chunk
+        zone = [(r + dr, c + dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if self._in_bounds(r + dr, c + dc)]
+        # Take the first click and its neighbours out of the plain layouts
+        removed = 0
+        for zr, zc in zone:
+            layout = self._layout(zr // size, zc // size)
+            i = (zr % size) * size + zc % size
+            removed += layout[i]
+            layout[i] = 0
+        self.safe_zone = frozenset(zone)
+        if self.mines is not None:
+            self.mines -= removed
+        # Chunks materialized for flags before the first click need fresh counts
+        flags = {key: chunk.flagged for key, chunk in self.chunks.items()}
+        self.chunks.clear()
+        for key, flagged in flags.items():
+            self._materialize(*key).flagged = flagged
+        self.mines_placed = True
+
+    # ---- moves ----
+
+    def reveal_cell(self, r, c):
+        # Returns the (r, c) cells revealed by this click
+        if self.is_game_over or not self._in_bounds(r, c):
+            return []
+        if not self.mines_placed:
+            if self.cell_state(r, c) == "F":
+                return []
+            self._place_mines(r, c)
+        chunk, i = self._chunk(r, c)
+        if chunk.flagged[i] or chunk.revealed[i]:
+            return []
+        if chunk.mines[i]:
+            chunk.revealed[i] = 1
+            self.changed.add((r, c))
+            self.is_game_over = True
+            self.is_win = False
+            return [(r, c)]
+        opened = self._flood(r, c)
+        self._check_win()
+        return opened
+
+    def _flood(self, r, c):
+        # Same scheme as flood.flood_fill: mark on push, only zero cells are pushed
+        chunk, i = self._chunk(r, c)
+        if chunk.revealed[i] or chunk.flagged[i]:
+            return []
+        chunk.revealed[i] = 1
+        opened = [(r, c)]
+        if chunk.adjacent[i]:
+            self._opened(opened)
+            return opened
+        in_bounds = self._in_bounds
+        stack = [(r, c)]
+        while stack:
+            r, c = stack.pop()
+            for dr, dc in _NEIGHBOURS:
+                nr, nc = r + dr, c + dc
+                if not in_bounds(nr, nc):
+                    continue
+                chunk, i = self._chunk(nr, nc)
+                if chunk.revealed[i] or chunk.flagged[i]:
+                    continue
+                chunk.revealed[i] = 1
+                opened.append((nr, nc))
+                if not chunk.adjacent[i]:
+                    stack.append((nr, nc))
+        self._opened(opened)
+        return opened
+
+    def _opened(self, opened):
+        self.revealed_count += len(opened)
+        self.changed.update(opened)
+
+    def chord(self, r, c):
+        # Reveal every hidden neighbour of a satisfied number; returns the cells revealed
+        if self.is_game_over or not self.mines_placed or not self._in_bounds(r, c):
+            return []
+        chunk, i = self._chunk(r, c)
+        if not chunk.revealed[i] or chunk.mines[i] or not chunk.adjacent[i]:
+            return []
+        neighbours = [(r + dr, c + dc) for dr, dc in _NEIGHBOURS if self._in_bounds(r + dr, c + dc)]
+        cells = [self._chunk(nr, nc) for nr, nc in neighbours]
+        if sum(chunk.flagged[j] for chunk, j in cells) != chunk.adjacent[i]:
+            return []
+        opened = []
+        hit_mine = False
+        for (nr, nc), (chunk, j) in zip(neighbours, cells):
+            if chunk.revealed[j] or chunk.flagged[j]:
+                continue
+            if chunk.mines[j]:
+                chunk.revealed[j] = 1
+                self.changed.add((nr, nc))
+                opened.append((nr, nc))
+                hit_mine = True
+                continue
+            opened.extend(self._flood(nr, nc))
+        if hit_mine:
+            self.is_game_over = True
+            self.is_win = False
+        else:
+            self._check_win()
+        return opened
+
+    def toggle_flag(self, r, c):
+        # Returns the new flag state, or None if the cell cannot be flagged
+        if self.is_game_over or not self._in_bounds(r, c):
+            return None
+        chunk, i = self._chunk(r, c)
+        if chunk.revealed[i]:
+            return None
+        flagged = not chunk.flagged[i]
+        chunk.flagged[i] = flagged
+        self.flag_count += 1 if flagged else -1
+        self.changed.add((r, c))
+        return flagged
+
+    @property
+    def safe_left(self):
+        # Unrevealed safe cells; None on an unbounded board
+        if self.mines is None:
+            return None
+        return self.rows * self.cols - self.mines - self.revealed_count
+
+    def _check_win(self):
+        if self.mines is not None and self.safe_left == 0:
+            self.is_game_over = True
+            self.is_win = True
+
+    def pop_changed(self):
+        changed = self.changed
+        self.changed = set()
+        return changed
+
+    # ---- views ----
+
+    def cell_state(self, r, c):
+        # Player-visible cell, as in HeadlessGame.snapshot(): '#' hidden,
+        # 'F' flag, '*' mine, '0'-'8' counts. Never materializes a chunk.
+        size = self.chunk
+        chunk = self.chunks.get((r // size, c // size))
+        if chunk is None:
+            return "#"
+        i = (r % size) * size + c % size
+        if chunk.revealed[i]:
+            return "*" if chunk.mines[i] else str(chunk.adjacent[i])
+        return "F" if chunk.flagged[i] else "#"
+
+    def window(self, top, left, height, width):
+        # Rows of cell_state() for a viewport
+        return ["".join(self.cell_state(r, c) for c in range(left, left + width))
+                for r in range(top, top + height)]
+
+    @property
+    def memory_cells(self):
+        # Cells held in memory: generated layouts and materialized planes
+        area = self.chunk * self.chunk
+        return len(self.layouts) * area + len(self.chunks) * 3 * area
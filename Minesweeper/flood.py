@@ -0,0 +1,33 @@
+# flood.py
+# The one flood-fill used by game.py and utils.dfs_reveal.
+#
+# Cells are flat indices (r * cols + c); kinds and offsets are the neighbour
+# tables of a geometry.Geometry, so the same fill works on any topology.
+
+
+def flood_fill(start, revealed, flagged, mines, adjacent, kinds, offsets):
+    # Reveals start and, from every zero cell reached, its neighbours.
+    # revealed doubles as the visited bitmap: a cell is marked when it is
+    # pushed, so nothing is pushed twice. Returns the newly revealed indices.
+    if revealed[start] or flagged[start]:
+        return []
+    revealed[start] = 1
+    opened = [start]
+    if mines[start] or adjacent[start]:
+        return opened
+    stack = [start]
+    push = stack.append
+    pop = stack.pop
+    record = opened.append
+    while stack:
+        i = pop()
+        for d in offsets[kinds[i]]:
+            j = i + d
+            if revealed[j] or flagged[j]:
+                continue
+            # Neighbours of a zero cell are never mines
+            revealed[j] = 1
+            record(j)
+            if not adjacent[j]:
+                push(j)
+    return opened
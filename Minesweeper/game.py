@@ -1,105 +1,340 @@
 # game.py
 
 import random
-from collections import deque
+
+from flood import flood_fill
+from geometry import get_geometry
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the pure-Python path is used without it
+    np = None
+
+
+# Level presets: rows, cols, mines, time limit in seconds (None for no limit)
+LEVELS = {
+    "Easy": (9, 9, 10, None),
+    "Medium": (16, 16, 40, None),
+    "Hard": (24, 24, 99, None),
+    "Time Challenge": (16, 16, 40, 120),
+    "Expert": (24, 24, 99, 60)
+}
+
 
 class Cell:
-    def __init__(self):
-        self.is_mine = False
-        self.revealed = False
-        self.flagged = False
-        self.adjacent_mines = 0
+    # Lightweight view of one cell; the state itself lives in the game's flat arrays
+    __slots__ = ("_game", "_i")
+
+    def __init__(self, game, index):
+        self._game = game
+        self._i = index
+
+    @property
+    def is_mine(self):
+        return bool(self._game.mine_map[self._i])
+
+    @is_mine.setter
+    def is_mine(self, value):
+        self._game.mine_map[self._i] = 1 if value else 0
+
+    @property
+    def revealed(self):
+        return bool(self._game.revealed_map[self._i])
+
+    @revealed.setter
+    def revealed(self, value):
+        game = self._game
+        value = 1 if value else 0
+        if game.revealed_map[self._i] != value:
+            if not game.mine_map[self._i]:
+                game.safe_left += -1 if value else 1
+            game.changed.add(self._i)
+        game.revealed_map[self._i] = value
+
+    @property
+    def flagged(self):
+        return bool(self._game.flagged_map[self._i])
+
+    @flagged.setter
+    def flagged(self, value):
+        game = self._game
+        value = 1 if value else 0
+        if game.flagged_map[self._i] != value:
+            game.flag_count += 1 if value else -1
+            game.changed.add(self._i)
+        game.flagged_map[self._i] = value
+
+    @property
+    def adjacent_mines(self):
+        return self._game.adjacent_map[self._i]
+
+    @adjacent_mines.setter
+    def adjacent_mines(self, value):
+        self._game.adjacent_map[self._i] = value
 
     def toggle_flag(self):
         self.flagged = not self.flagged
 
+    def __repr__(self):
+        r, c = divmod(self._i, self._game.cols)
+        return f"Cell({r}, {c}, Mine={self.is_mine}, Revealed={self.revealed})"
+
+
+class BoardRow:
+    __slots__ = ("_game", "_start")
+
+    def __init__(self, game, r):
+        self._game = game
+        self._start = r * game.cols
+
+    def __len__(self):
+        return self._game.cols
+
+    def __getitem__(self, c):
+        cols = self._game.cols
+        if c < 0:
+            c += cols
+        if not 0 <= c < cols:
+            raise IndexError("column index out of range")
+        return Cell(self._game, self._start + c)
+
+    def __iter__(self):
+        for i in range(self._start, self._start + self._game.cols):
+            yield Cell(self._game, i)
+
+
+class BoardView:
+    # Keeps the old board[r][c].attr access working on top of the flat arrays
+    __slots__ = ("_game",)
+
+    def __init__(self, game):
+        self._game = game
+
+    def __len__(self):
+        return self._game.rows
+
+    def __getitem__(self, r):
+        rows = self._game.rows
+        if r < 0:
+            r += rows
+        if not 0 <= r < rows:
+            raise IndexError("row index out of range")
+        return BoardRow(self._game, r)
+
+    def __iter__(self):
+        for r in range(self._game.rows):
+            yield BoardRow(self._game, r)
+
 
 class MinesweeperGame:
-    def __init__(self, rows, cols, mines):
+    def __init__(self, rows, cols, mines, seed=None, rng=None, debug=False, topology="square"):
+        if not 0 <= mines < rows * cols:
+            raise ValueError(f"Cannot place {mines} mines on a {rows}x{cols} board")
         self.rows = rows
         self.cols = cols
         self.mines = mines
-        self.board = [[Cell() for _ in range(cols)] for _ in range(rows)]
+        # Keep the seed so a board can be regenerated; an explicit rng wins over it
+        if rng is None:
+            if seed is None:
+                seed = random.getrandbits(64)
+            rng = random.Random(seed)
+        self.seed = seed
+        self.rng = rng
+        # One byte per cell and per plane, indexed by r * cols + c
+        size = rows * cols
+        self.mine_map = bytearray(size)
+        self.revealed_map = bytearray(size)
+        self.flagged_map = bytearray(size)
+        self.adjacent_map = bytearray(size)
+        # Neighbour tables, shared by every game with the same size and topology
+        self.geometry = get_geometry(rows, cols, topology)
+        self.board = BoardView(self)
+        # Unrevealed safe cells; the game is won when this reaches zero
+        self.safe_left = size - mines
+        self.flag_count = 0
+        # Cross-check safe_left against a full scan on every win check
+        self.debug = debug
+        # Flat indices of cells whose visible state changed since the last pop_changed()
+        self.changed = set()
         self.is_game_over = False
         self.is_win = False
         self.mines_placed = False  # Delay mine placement
 
     def _place_mines(self, safe_r, safe_c):
-        positions = set()
-        forbidden = {(safe_r, safe_c)}
-        # Optionally, avoid placing mines around the first click 
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                nr, nc = safe_r + dr, safe_c + dc
-                if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                    forbidden.add((nr, nc))
-        while len(positions) < self.mines:
-            r = random.randint(0, self.rows - 1)
-            c = random.randint(0, self.cols - 1)
-            if (r, c) in forbidden or self.board[r][c].is_mine:
-                continue
-            self.board[r][c].is_mine = True
-            positions.add((r, c))
+        mine_map = self.mine_map
+        # Avoid placing mines on and around the first click
+        safe = safe_r * self.cols + safe_c
+        forbidden = sorted({safe, *self.geometry.neighbours(safe)})
+        free = self.rows * self.cols - len(forbidden)
+        if self.mines > free:
+            raise ValueError(
+                f"Cannot place {self.mines} mines: only {free} cells are free "
+                f"around the first click at ({safe_r}, {safe_c})"
+            )
+        # Sample positions among the free cells only, then shift each one past
+        # the forbidden indices below it, so this is O(mines) at any density
+        for i in self.rng.sample(range(free), self.mines):
+            for f in forbidden:
+                if i < f:
+                    break
+                i += 1
+            mine_map[i] = 1
+        self._calculate_adjacent_mines()
+        self.mines_placed = True
+
+    def place_layout(self, mine_map):
+        # Use a prepared layout (0/1 per cell) instead of placing mines on the first click
+        if self.mines_placed:
+            raise ValueError("Mines are already placed")
+        if len(mine_map) != self.rows * self.cols or sum(mine_map) != self.mines:
+            raise ValueError(f"Layout does not match a {self.rows}x{self.cols} board with {self.mines} mines")
+        self.mine_map[:] = mine_map
         self._calculate_adjacent_mines()
         self.mines_placed = True
 
     def _calculate_adjacent_mines(self):
-        for r in range(self.rows):
-            for c in range(self.cols):
-                if self.board[r][c].is_mine:
-                    continue
-                count = 0
-                for dr in [-1, 0, 1]:
-                    for dc in [-1, 0, 1]:
-                        nr, nc = r + dr, c + dc
-                        if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                            if self.board[nr][nc].is_mine:
-                                count += 1
-                self.board[r][c].adjacent_mines = count
+        if np is not None and self.geometry.topology == "square":
+            self._calculate_adjacent_mines_numpy()
+        else:
+            self._calculate_adjacent_mines_python()
+
+    def _calculate_adjacent_mines_numpy(self):
+        rows, cols = self.rows, self.cols
+        mines = np.frombuffer(self.mine_map, dtype=np.uint8).reshape(rows, cols)
+        # Sum the 3x3 window of every cell via shifted slices of a zero-padded copy
+        padded = np.zeros((rows + 2, cols + 2), dtype=np.uint8)
+        padded[1:-1, 1:-1] = mines
+        counts = np.zeros((rows, cols), dtype=np.uint8)
+        for dr in range(3):
+            for dc in range(3):
+                counts += padded[dr:dr + rows, dc:dc + cols]
+        counts[mines != 0] = 0
+        self.adjacent_map[:] = counts.tobytes()
+
+    def _calculate_adjacent_mines_python(self):
+        # Each mine adds one to its neighbours, then mines themselves are cleared
+        mine_map = self.mine_map
+        adjacent_map = self.adjacent_map
+        kinds, offsets = self.geometry.kinds, self.geometry.offsets
+        adjacent_map[:] = bytes(len(adjacent_map))
+        mines = [i for i, mine in enumerate(mine_map) if mine]
+        for i in mines:
+            for d in offsets[kinds[i]]:
+                adjacent_map[i + d] += 1
+        for i in mines:
+            adjacent_map[i] = 0
 
     def reveal_cell(self, r, c):
-        if self.board[r][c].flagged or self.board[r][c].revealed:
-            return
+        # Returns the flat indices revealed by this click
+        i = r * self.cols + c
+        if self.flagged_map[i] or self.revealed_map[i]:
+            return []
 
         # Place mines on first click, ensuring (r, c) is safe
         if not self.mines_placed:
             self._place_mines(r, c)
 
-        if self.board[r][c].is_mine:
-            self.board[r][c].revealed = True
+        if self.mine_map[i]:
+            self.revealed_map[i] = 1
+            self.changed.add(i)
             self.is_game_over = True
             self.is_win = False
-            return
+            return [i]
 
-        self._dfs_reveal(r, c)
+        opened = self._dfs_reveal(r, c)
         self._check_win()
+        return opened
 
     def _dfs_reveal(self, r, c):
-        stack = deque()
-        stack.append((r, c))
+        opened = flood_fill(r * self.cols + c, self.revealed_map, self.flagged_map, self.mine_map,
+                            self.adjacent_map, self.geometry.kinds, self.geometry.offsets)
+        self.safe_left -= len(opened)
+        self.changed.update(opened)
+        return opened
 
-        while stack:
-            x, y = stack.pop()
-            cell = self.board[x][y]
-            if cell.revealed or cell.flagged:
+    def chord(self, r, c):
+        # On a revealed number whose neighbouring flags match its count, reveal
+        # every other hidden neighbour at once: one batch of floods, one win
+        # check. Returns the flat indices revealed.
+        i = r * self.cols + c
+        if self.is_game_over or not self.revealed_map[i] or self.mine_map[i] or not self.adjacent_map[i]:
+            return []
+        neighbours = self.geometry.neighbours(i)
+        flagged_map = self.flagged_map
+        if sum(flagged_map[j] for j in neighbours) != self.adjacent_map[i]:
+            return []
+        revealed_map, mine_map, adjacent_map = self.revealed_map, self.mine_map, self.adjacent_map
+        kinds, offsets = self.geometry.kinds, self.geometry.offsets
+        opened = []
+        hit_mine = False
+        for j in neighbours:
+            if revealed_map[j] or flagged_map[j]:
                 continue
-            cell.revealed = True
-            if cell.adjacent_mines == 0:
-                for dx in [-1, 0, 1]:
-                    for dy in [-1, 0, 1]:
-                        nx, ny = x + dx, y + dy
-                        if 0 <= nx < self.rows and 0 <= ny < self.cols:
-                            neighbor = self.board[nx][ny]
-                            if not neighbor.revealed and not neighbor.is_mine:
-                                stack.append((nx, ny))
+            if mine_map[j]:
+                revealed_map[j] = 1
+                opened.append(j)
+                hit_mine = True
+                continue
+            opened.extend(flood_fill(j, revealed_map, flagged_map, mine_map, adjacent_map, kinds, offsets))
+        self.changed.update(opened)
+        self.safe_left -= sum(1 for j in opened if not mine_map[j])
+        if hit_mine:
+            self.is_game_over = True
+            self.is_win = False
+        else:
+            self._check_win()
+        return opened
+
+    def toggle_flag(self, r, c):
+        # Returns the new flag state, or None if the cell cannot be flagged
+        i = r * self.cols + c
+        if self.is_game_over or self.revealed_map[i]:
+            return None
+        flagged = not self.flagged_map[i]
+        self.flagged_map[i] = flagged
+        self.flag_count += 1 if flagged else -1
+        self.changed.add(i)
+        return flagged
+
+    @property
+    def mines_remaining(self):
+        return self.mines - self.flag_count
+
+    def reveal_all(self):
+        revealed_map = self.revealed_map
+        self.changed.update(i for i in range(self.rows * self.cols) if not revealed_map[i])
+        revealed_map[:] = b"\x01" * (self.rows * self.cols)
+        self.safe_left = 0
+
+    def pop_changed(self):
+        changed = self.changed
+        self.changed = set()
+        return changed
+
+    def copy(self):
+        # Independent game in the same state; the geometry tables stay shared
+        other = object.__new__(MinesweeperGame)
+        other.__dict__.update(self.__dict__)
+        other.rng = random.Random()
+        other.rng.setstate(self.rng.getstate())
+        other.mine_map = bytearray(self.mine_map)
+        other.revealed_map = bytearray(self.revealed_map)
+        other.flagged_map = bytearray(self.flagged_map)
+        other.adjacent_map = bytearray(self.adjacent_map)
+        other.board = BoardView(other)
+        other.changed = set(self.changed)
+        return other
+
+    def _count_safe_left(self):
+        mine_map = self.mine_map
+        revealed_map = self.revealed_map
+        return sum(1 for i in range(self.rows * self.cols) if not mine_map[i] and not revealed_map[i])
 
     def _check_win(self):
-        for r in range(self.rows):
-            for c in range(self.cols):
-                cell = self.board[r][c]
-                if not cell.is_mine and not cell.revealed:
-                    return
-        self.is_game_over = True
-        self.is_win = True
-
-    
\ No newline at end of file
+        if self.debug:
+            actual = self._count_safe_left()
+            if actual != self.safe_left:
+                raise AssertionError(f"safe_left is {self.safe_left} but a full scan finds {actual}")
+        if self.safe_left == 0:
+            self.is_game_over = True
+            self.is_win = True
@@ -0,0 +1,136 @@
+# geometry.py
+# Neighbour tables per board geometry, shared by every algorithm in the game core.
+#
+# Cells are flat indices (r * cols + c). Cells whose neighbours sit at the same
+# index deltas share a "kind": kinds[i] picks a tuple in offsets, so
+# neighbours of i are i + d for d in offsets[kinds[i]]. Tables are built once
+# per (rows, cols, topology) and kept in an LRU cache.
+#
+# A new topology subclasses Geometry, overrides cell_neighbours() (and row_key()
+# or column_key() if rows or columns of the same border class still differ)
+# and registers itself. check() compares the tables with cell_neighbours()
+# for every cell.
+
+from functools import lru_cache
+
+SQUARE_DELTAS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+TOPOLOGIES = {}
+
+
+def _position_class(k, n):
+    # 0 first, 1 middle, 2 last, 3 only
+    if n == 1:
+        return 3
+    if k == 0:
+        return 0
+    return 2 if k == n - 1 else 1
+
+
+def register_topology(cls):
+    TOPOLOGIES[cls.topology] = cls
+    _cached_geometry.cache_clear()
+    return cls
+
+
+def get_geometry(rows, cols, topology="square"):
+    # Positional call below so get_geometry(r, c) and get_geometry(r, c, "square") share one entry
+    return _cached_geometry(rows, cols, topology)
+
+
+@lru_cache(maxsize=16)
+def _cached_geometry(rows, cols, topology):
+    return TOPOLOGIES[topology](rows, cols)
+
+
+class Geometry:
+    topology = None
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.kinds, self.offsets = self._build()
+        self.max_neighbours = max(len(offsets) for offsets in self.offsets)
+
+    def row_key(self, r):
+        # Rows with the same key have the same neighbour pattern
+        return _position_class(r, self.rows)
+
+    def column_key(self, c):
+        # Columns with the same key have the same neighbour pattern within a row
+        return _position_class(c, self.cols)
+
+    def cell_neighbours(self, r, c):
+        raise NotImplementedError
+
+    def _build(self):
+        rows, cols = self.rows, self.cols
+        kind_ids = {}
+        offsets = []
+        patterns = {}
+        chunks = []
+        column_keys = [self.column_key(c) for c in range(cols)]
+        # One representative column per column key
+        columns = {}
+        for c, key in enumerate(column_keys):
+            columns.setdefault(key, c)
+        for r in range(rows):
+            key = self.row_key(r)
+            if key not in patterns:
+                ids = {}
+                for column_key, c in columns.items():
+                    deltas = self._deltas(r, c)
+                    if deltas not in kind_ids:
+                        kind_ids[deltas] = len(offsets)
+                        offsets.append(deltas)
+                    ids[column_key] = kind_ids[deltas]
+                patterns[key] = bytes(ids[k] for k in column_keys)
+            chunks.append(patterns[key])
+        return bytearray().join(chunks), tuple(offsets)
+
+    def _deltas(self, r, c):
+        base = r * self.cols + c
+        return tuple(sorted({nr * self.cols + nc - base for nr, nc in self.cell_neighbours(r, c)} - {0}))
+
+    def check(self):
+        # Cells whose table entry disagrees with cell_neighbours(); a full scan, for tests
+        return [(r, c) for r in range(self.rows) for c in range(self.cols)
+                if self.offsets[self.kinds[r * self.cols + c]] != self._deltas(r, c)]
+
+    def neighbours(self, i):
+        return [i + d for d in self.offsets[self.kinds[i]]]
+
+
+@register_topology
+class SquareGeometry(Geometry):
+    topology = "square"
+
+    def cell_neighbours(self, r, c):
+        rows, cols = self.rows, self.cols
+        return [(r + dr, c + dc) for dr, dc in SQUARE_DELTAS
+                if 0 <= r + dr < rows and 0 <= c + dc < cols]
+
+
+@register_topology
+class TorusGeometry(Geometry):
+    # Edges wrap around: the left column borders the right one, top borders bottom
+    topology = "torus"
+
+    def cell_neighbours(self, r, c):
+        return [((r + dr) % self.rows, (c + dc) % self.cols) for dr, dc in SQUARE_DELTAS]
+
+
+@register_topology
+class HexGeometry(Geometry):
+    # Pointy-top hexagons with odd rows shifted half a cell right: six neighbours
+    topology = "hex"
+
+    def row_key(self, r):
+        return _position_class(r, self.rows), r % 2
+
+    def cell_neighbours(self, r, c):
+        shift = r % 2
+        deltas = ((0, -1), (0, 1), (-1, shift - 1), (-1, shift), (1, shift - 1), (1, shift))
+        rows, cols = self.rows, self.cols
+        return [(r + dr, c + dc) for dr, dc in deltas
+                if 0 <= r + dr < rows and 0 <= c + dc < cols]
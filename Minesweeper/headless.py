@@ -0,0 +1,81 @@
+# headless.py
+# GUI-free wrapper around MinesweeperGame for scripts, simulations and servers.
+
+from game import LEVELS, MinesweeperGame
+
+
+class HeadlessGame:
+    def __init__(self, level="Easy", seed=None, rows=None, cols=None, mines=None, topology="square"):
+        self.game = None
+        self.last_changed = set()
+        self.new_game(level, seed, rows, cols, mines, topology)
+
+    @classmethod
+    def from_game(cls, game, level="Custom"):
+        # Wrap an existing game, e.g. a loaded save or a replay snapshot
+        headless = cls.__new__(cls)
+        headless.game = game
+        headless.level = level
+        headless.time_limit = None
+        headless.last_changed = set()
+        return headless
+
+    def new_game(self, level="Easy", seed=None, rows=None, cols=None, mines=None, topology="square"):
+        # Explicit rows/cols/mines override the level preset
+        if rows is None:
+            rows, cols, mines, self.time_limit = LEVELS[level]
+        else:
+            self.time_limit = None
+        self.level = level
+        self.game = MinesweeperGame(rows, cols, mines, seed=seed, topology=topology)
+        self.last_changed = set()
+        return self.game
+
+    # Every move returns the flat indices (r * cols + c) of the cells it changed,
+    # also kept in last_changed for policies that track the board incrementally
+
+    def _changed(self):
+        self.last_changed = self.game.pop_changed()
+        return self.last_changed
+
+    def reveal(self, r, c):
+        self.game.reveal_cell(r, c)
+        return self._changed()
+
+    def flag(self, r, c):
+        self.game.toggle_flag(r, c)
+        return self._changed()
+
+    def chord(self, r, c):
+        self.game.chord(r, c)
+        return self._changed()
+
+    @property
+    def state(self):
+        if not self.game.is_game_over:
+            return "playing"
+        return "won" if self.game.is_win else "lost"
+
+    def cell_state(self, i):
+        # Player-visible cell: '#' hidden, 'F' flag, '*' mine, '0'-'8' counts
+        game = self.game
+        if game.revealed_map[i]:
+            return "*" if game.mine_map[i] else str(game.adjacent_map[i])
+        return "F" if game.flagged_map[i] else "#"
+
+    def snapshot(self):
+        game = self.game
+        cols = game.cols
+        cells = [self.cell_state(i) for i in range(game.rows * cols)]
+        return {
+            "level": self.level,
+            "rows": game.rows,
+            "cols": cols,
+            "mines": game.mines,
+            "seed": game.seed,
+            "state": self.state,
+            "flags": game.flag_count,
+            "mines_remaining": game.mines_remaining,
+            "safe_left": game.safe_left,
+            "board": ["".join(cells[r * cols:(r + 1) * cols]) for r in range(game.rows)],
+        }
@@ -0,0 +1,173 @@
+# instrument.py
+# Opt-in timings and counters for the hot paths, plus profiler wrappers.
+#
+# Off unless MINESWEEPER_STATS=1 is set or enable() is called (main.py --stats).
+# While off, STATS is None and every call site is a single `is not None`
+# check. While on, each series keeps its last CAPACITY samples in a ring
+# buffer (a preallocated array, no allocation per sample), counters are plain
+# ints, and summary() reports count/mean/p50/p95/p99/max per series.
+#
+#   MINESWEEPER_STATS=1 python main.py          # F12 shows the stats, stats.json on quit
+#   python main.py --profile session.prof       # cProfile of the whole session
+#   python main.py --sample session.folded      # sampled stacks, flamegraph input
+
+import json
+import os
+import sys
+import threading
+import time
+from array import array
+from collections import Counter
+
+CAPACITY = 4096
+
+STATS = None
+
+
+class Ring:
+    # The last `capacity` samples of one series
+    __slots__ = ("values", "capacity", "count")
+
+    def __init__(self, capacity=CAPACITY):
+        self.values = array("d", bytes(8 * capacity))
+        self.capacity = capacity
+        self.count = 0
+
+    def add(self, value):
+        self.values[self.count % self.capacity] = value
+        self.count += 1
+
+    def samples(self):
+        if self.count < self.capacity:
+            return self.values[:self.count].tolist()
+        return self.values.tolist()
+
+    def summary(self):
+        samples = sorted(self.samples())
+        if not samples:
+            return {"count": 0}
+        n = len(samples)
+        return {
+            "count": self.count,
+            "mean": sum(samples) / n,
+            "p50": samples[n // 2],
+            "p95": samples[min(n - 1, n * 95 // 100)],
+            "p99": samples[min(n - 1, n * 99 // 100)],
+            "max": samples[-1],
+        }
+
+
+class Stats:
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self.series = {}
+        self.counters = Counter()
+        self.started = time.time()
+
+    def record(self, name, value):
+        ring = self.series.get(name)
+        if ring is None:
+            ring = self.series[name] = Ring(self.capacity)
+        ring.add(value)
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def summary(self):
+        return {
+            "uptime": time.time() - self.started,
+            "series": {name: ring.summary() for name, ring in sorted(self.series.items())},
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def format(self):
+        # Text for the stats panel; series ending in _ms are milliseconds
+        lines = []
+        for name, s in self.summary()["series"].items():
+            if not s["count"]:
+                continue
+            lines.append(f"{name}: n={s['count']} mean={s['mean']:.2f} p50={s['p50']:.2f} "
+                         f"p95={s['p95']:.2f} p99={s['p99']:.2f} max={s['max']:.2f}")
+        for name, n in sorted(self.counters.items()):
+            lines.append(f"{name}: {n}")
+        return "\n".join(lines) or "No samples yet."
+
+    def dump(self, path):
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+        os.replace(tmp, path)
+
+
+def enable(capacity=CAPACITY):
+    global STATS
+    if STATS is None:
+        STATS = Stats(capacity)
+    return STATS
+
+
+if os.environ.get("MINESWEEPER_STATS") == "1":
+    enable()
+
+
+class Sampler:
+    # Statistical profiler: a thread snapshots the target thread's stack every
+    # `interval` seconds and counts identical stacks. write() emits
+    # "outer;inner count" lines, the folded format flamegraph tools read.
+    def __init__(self, interval=0.005, thread=None):
+        self.interval = interval
+        self.target = (thread or threading.main_thread()).ident
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+                self.samples += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def write(self, path):
+        with open(path, "w") as f:
+            for stack, n in self.stacks.most_common():
+                f.write(f"{stack} {n}\n")
+
+
+def profile_call(run, profile_path=None, sample_path=None):
+    # Runs run() under cProfile and/or the sampler, writing each to its path
+    profiler = sampler = None
+    if profile_path:
+        import cProfile
+        profiler = cProfile.Profile()
+    if sample_path:
+        sampler = Sampler().start()
+    try:
+        if profiler is not None:
+            return profiler.runcall(run)
+        return run()
+    finally:
+        if sampler is not None:
+            sampler.stop()
+            sampler.write(sample_path)
+            print(f"[PROFILE] {sampler.samples} stack samples written to {sample_path}")
+        if profiler is not None:
+            profiler.dump_stats(profile_path)
+            print(f"[PROFILE] cProfile stats written to {profile_path} (python -m pstats {profile_path})")
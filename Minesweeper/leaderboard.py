@@ -0,0 +1,244 @@
+# leaderboard.py
+# SQLite-backed score history. Every game is kept (no top-10 truncation),
+# writes are single transactions so concurrent games cannot clobber each
+# other, and WAL mode lets readers run while a game is being recorded.
+
+import atexit
+import heapq
+import itertools
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+import instrument
+
+DEFAULT_PATH = "leaderboard.db"
+LEGACY_JSON = "leaderboard.json"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    level TEXT NOT NULL,
+    duration INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_level_rank ON scores (level, score DESC, duration);
+CREATE INDEX IF NOT EXISTS scores_rank ON scores (score DESC, duration);
+CREATE INDEX IF NOT EXISTS scores_duration ON scores (level, duration);
+"""
+
+
+class LeaderboardStore:
+    def __init__(self, path=DEFAULT_PATH, legacy_json=None):
+        self.path = path
+        if legacy_json is None:
+            legacy_json = os.path.join(os.path.dirname(path), LEGACY_JSON)
+        self.legacy_json = legacy_json
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def _init_db(self):
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                conn.executescript(_SCHEMA)
+                empty = conn.execute("SELECT NOT EXISTS (SELECT 1 FROM scores)").fetchone()[0]
+                if empty:
+                    self._import_legacy(conn)
+
+    def _import_legacy(self, conn):
+        # One-time import of the old leaderboard.json, if there is one
+        if not os.path.exists(self.legacy_json):
+            return
+        try:
+            with open(self.legacy_json, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[WARNING] Could not import {self.legacy_json}: {e}")
+            return
+        if isinstance(data, list):
+            conn.executemany(
+                "INSERT INTO scores (name, score, level, duration) VALUES (?, ?, ?, ?)",
+                [_row(entry) for entry in data if isinstance(entry, dict)],
+            )
+
+    def add(self, name, score, level, duration):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO scores (name, score, level, duration) VALUES (?, ?, ?, ?)",
+                (name, score, level, duration),
+            )
+
+    def add_many(self, entries):
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT INTO scores (name, score, level, duration) VALUES (?, ?, ?, ?)",
+                [_row(entry) for entry in entries],
+            )
+
+    def replace_all(self, entries):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM scores")
+            conn.executemany(
+                "INSERT INTO scores (name, score, level, duration) VALUES (?, ?, ?, ?)",
+                [_row(entry) for entry in entries],
+            )
+
+    def top(self, k=10, level=None):
+        # Highest score first, fastest time breaks ties
+        query = "SELECT name, score, level, duration FROM scores"
+        params = ()
+        if level is not None:
+            query += " WHERE level = ?"
+            params = (level,)
+        query += " ORDER BY score DESC, duration ASC, id ASC LIMIT ?"
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query, params + (k,)).fetchall()
+        return [{"name": n, "score": s, "level": lv, "duration": d} for n, s, lv, d in rows]
+
+    def levels(self):
+        with closing(self._connect()) as conn:
+            return [row[0] for row in conn.execute("SELECT DISTINCT level FROM scores ORDER BY level")]
+
+    def count(self):
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+
+def _row(entry):
+    return (entry.get("name", "Unknown"), int(entry.get("score", 0)),
+            entry.get("level", "N/A"), int(entry.get("duration", 0)))
+
+
+_stores = {}
+
+
+def get_store(path=DEFAULT_PATH):
+    # One store per database file per process
+    store = _stores.get(path)
+    if store is None:
+        store = _stores[path] = LeaderboardStore(path)
+    return store
+
+
+class LeaderboardCache:
+    # Process-level top-K view of a store. Each level (and the overall board)
+    # keeps a bounded min-heap whose root is the weakest entry, so an insert
+    # is O(log K). Writes reach the database on a background thread; the cache
+    # reloads when the database files change under it (another process wrote).
+    def __init__(self, store, k=10):
+        self.store = store
+        self.k = k
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._heaps = {}
+        self._overall = []
+        self._signature = None
+        # Set when a queued write failed: the heaps hold a score that is not on disk
+        self._stale = False
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="leaderboard-writer", daemon=True)
+        self._writer.start()
+        self.reload()
+
+    def _file_signature(self):
+        signature = []
+        for path in (self.store.path, self.store.path + "-wal"):
+            try:
+                st = os.stat(path)
+                signature.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _key(self, entry):
+        # Heap order: lowest score, then slowest time, then newest is weakest
+        return (entry["score"], -entry["duration"], -next(self._seq))
+
+    def _push(self, heap, entry):
+        item = (self._key(entry), entry)
+        if len(heap) < self.k:
+            heapq.heappush(heap, item)
+        elif item[0] > heap[0][0]:
+            heapq.heapreplace(heap, item)
+
+    def reload(self):
+        start = time.perf_counter()
+        signature = self._file_signature()
+        entries = {level: self.store.top(self.k, level) for level in self.store.levels()}
+        overall = self.store.top(self.k)
+        with self._lock:
+            self._heaps = {}
+            for level, rows in entries.items():
+                heap = self._heaps[level] = []
+                for entry in rows:
+                    self._push(heap, entry)
+            self._overall = []
+            for entry in overall:
+                self._push(self._overall, entry)
+            self._signature = signature
+            self._stale = False
+        if instrument.STATS is not None:
+            instrument.STATS.record("leaderboard_load_ms", (time.perf_counter() - start) * 1000)
+
+    def add(self, name, score, level, duration):
+        entry = {"name": name, "score": score, "level": level, "duration": duration}
+        with self._lock:
+            self._push(self._heaps.setdefault(level, []), entry)
+            self._push(self._overall, entry)
+        self._queue.put(entry)
+
+    def top(self, level=None):
+        if self._queue.unfinished_tasks == 0 and (self._stale or self._file_signature() != self._signature):
+            self.reload()
+        with self._lock:
+            heap = self._overall if level is None else self._heaps.get(level, [])
+            return [entry for _, entry in sorted(heap, key=lambda item: item[0], reverse=True)]
+
+    def flush(self):
+        # Block until every queued score is on disk
+        self._queue.join()
+
+    def _write_loop(self):
+        while True:
+            entry = self._queue.get()
+            start = time.perf_counter()
+            try:
+                self.store.add(entry["name"], entry["score"], entry["level"], entry["duration"])
+                if instrument.STATS is not None:
+                    instrument.STATS.record("leaderboard_save_ms", (time.perf_counter() - start) * 1000)
+            except Exception as e:
+                # Anything, not just sqlite3.Error: if this thread died, later
+                # scores would queue with no consumer and flush() would hang
+                print(f"[ERROR] Failed to save score: {e!r}")
+                with self._lock:
+                    self._stale = True
+            finally:
+                # Our own write must not look like someone else's change
+                if self._queue.unfinished_tasks == 1:
+                    with self._lock:
+                        self._signature = self._file_signature()
+                self._queue.task_done()
+
+
+_caches = {}
+
+
+def get_cache(path=DEFAULT_PATH, k=10):
+    cache = _caches.get(path)
+    if cache is None:
+        cache = _caches[path] = LeaderboardCache(get_store(path), k)
+    return cache
+
+
+@atexit.register
+def _flush_caches():
+    for cache in _caches.values():
+        cache.flush()
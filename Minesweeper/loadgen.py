@@ -0,0 +1,162 @@
+# loadgen.py
+# Load generator for server.py: many concurrent sessions on loopback, each
+# one connection that plays seeded games back to back (a new game as soon as
+# one ends). A session sends one move and waits for its delta, so the latency
+# is the full round trip. Reports sustained moves/sec and latency percentiles.
+#
+#   python loadgen.py --serve --sessions 2000 --duration 10 --level Expert
+#   python loadgen.py --port 8765 --sessions 500          # against a running server
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from array import array
+
+from game import LEVELS
+from server import DEFAULT_PORT
+
+# Connections opened at once while the sessions start up
+CONNECT_BATCH = 256
+
+
+class Client:
+    def __init__(self, reader, writer, level, seed):
+        self.reader = reader
+        self.writer = writer
+        self.level = level
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.hidden = []
+        self.results = {"won": 0, "lost": 0, "timeout": 0}
+
+    async def request(self, line):
+        self.writer.write(line.encode())
+        while True:
+            reply = await self.reader.readline()
+            if not reply:
+                raise ConnectionError("server closed the connection")
+            # Pushed updates (only "U timeout" here: nobody else plays these boards);
+            # the move or NEW reply that follows reports the state anyway
+            if not reply.startswith(b"U "):
+                return reply.decode().split()
+
+    async def new_game(self):
+        words = await self.request(f"NEW {self.level} {self.seed}\n")
+        if words[0] != "OK":
+            raise RuntimeError(" ".join(words))
+        self.seed += 1
+        rows, cols = int(words[2]), int(words[3])
+        self.hidden = list(range(rows * cols))
+        self.cols = cols
+
+    def pick(self):
+        # A random cell this client still sees as hidden (swap-remove)
+        k = self.rng.randrange(len(self.hidden))
+        hidden = self.hidden
+        hidden[k], hidden[-1] = hidden[-1], hidden[k]
+        return divmod(hidden.pop(), self.cols)
+
+    def apply(self, words):
+        # words: D <state> <i>:<cell> ...; returns the game state
+        if words[0] != "D":
+            raise RuntimeError(" ".join(words))
+        if len(words) > 2:
+            opened = {int(cell.partition(":")[0]) for cell in words[2:]}
+            self.hidden = [i for i in self.hidden if i not in opened]
+        return words[1]
+
+    async def run(self, stop, latencies):
+        await self.new_game()
+        perf_counter = time.perf_counter
+        while not stop.is_set():
+            if not self.hidden:
+                await self.new_game()
+                continue
+            r, c = self.pick()
+            start = perf_counter()
+            words = await self.request(f"R {r} {c}\n")
+            latencies.append(perf_counter() - start)
+            state = self.apply(words)
+            if state != "playing":
+                self.results[state] += 1
+                await self.new_game()
+        self.writer.write(b"QUIT\n")
+        self.writer.close()
+
+
+async def _connect(host, port, gate):
+    async with gate:
+        return await asyncio.open_connection(host, port)
+
+
+async def run_load(host, port, sessions, duration, level, seed=0):
+    gate = asyncio.Semaphore(CONNECT_BATCH)
+    connections = await asyncio.gather(*(_connect(host, port, gate) for _ in range(sessions)))
+    # Sessions start from seeds far apart so no two play the same boards
+    clients = [Client(reader, writer, level, seed + k * 1000000) for k, (reader, writer) in enumerate(connections)]
+    stop = asyncio.Event()
+    latencies = array("d")
+    start = time.perf_counter()
+    tasks = [asyncio.create_task(client.run(stop, latencies)) for client in clients]
+    await asyncio.sleep(duration)
+    stop.set()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    results = {"won": 0, "lost": 0, "timeout": 0}
+    for client in clients:
+        for state, n in client.results.items():
+            results[state] += n
+    return latencies, elapsed, results
+
+
+def _start_server(host):
+    # server.py in its own process, so client and server do not share an event loop
+    here = os.path.dirname(os.path.abspath(__file__))
+    process = subprocess.Popen([sys.executable, os.path.join(here, "server.py"), "--host", host, "--port", "0"],
+                               stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line.startswith("Serving on "):
+        process.kill()
+        raise RuntimeError(f"server did not start: {line!r}")
+    return process, int(line.rsplit(":", 1)[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for the Minesweeper server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--serve", action="store_true", help="start server.py on a free port for the run")
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load after connecting")
+    parser.add_argument("--level", default="Expert", choices=list(LEVELS))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    process = None
+    port = args.port
+    if args.serve:
+        process, port = _start_server(args.host)
+    try:
+        latencies, elapsed, results = asyncio.run(
+            run_load(args.host, port, args.sessions, args.duration, args.level, args.seed))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+    if not latencies:
+        print("No moves completed")
+        return
+    samples = sorted(latencies)
+    n = len(samples)
+    print(f"{args.sessions} sessions, {args.level}, {elapsed:.1f}s: {n} moves, {n / elapsed:,.0f} moves/sec")
+    print(f"  games finished: {results['won']} won, {results['lost']} lost, {results['timeout']} timed out")
+    print(f"  latency ms: p50 {1000 * samples[n // 2]:.2f}  p90 {1000 * samples[n * 9 // 10]:.2f}  "
+          f"p99 {1000 * samples[min(n - 1, n * 99 // 100)]:.2f}  max {1000 * samples[-1]:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,17 @@
+import argparse
 import tkinter as tk
 from tkinter import messagebox, simpledialog, ttk
 import time
-import pygame
 import os
-from game import MinesweeperGame
-from utils import format_time, add_score, load_leaderboard
+import sqlite3
+import instrument
+from game import LEVELS, MinesweeperGame
+from leaderboard import get_cache
+from noguess import BoardPool, level_configs
+from replay import CHORD, FLAG, REVEAL, TIMEOUT, MoveLog
+from savefile import load_game, save_game
+from sound import SoundManager
+from utils import format_time
 
 # ========== THEME COLORS ==========
 COLOR_BG = "#1e1e2e"              
@@ -24,29 +31,14 @@ COLOR_PROGRESS_FG = "#89b4fa"
 COLOR_PROGRESS_DANGER = "#f38ba8" 
 # ==================================
 
-pygame.mixer.init()
-
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SAVE_PATH = os.path.join(BASE_DIR, "savegame.msw")
+REPLAY_PATH = os.path.join(BASE_DIR, "replay.mslog")
+NOGUESS_PATH = os.path.join(BASE_DIR, "noguess.db")
+STATS_PATH = os.path.join(BASE_DIR, "stats.json")
 
-def load_sound(file_name):
-    full_path = os.path.join(BASE_DIR, file_name)
-    if os.path.exists(full_path):
-        return pygame.mixer.Sound(full_path)
-    else:
-        print(f"[WARNING] Sound file not found: {file_name}")
-        return None
-
-click_sound = load_sound("./src/click.wav")
-explosion_sound = load_sound("./src/explosion.wav")
-win_sound = load_sound("./src/win.wav")
-
-bg_music_path = os.path.join(BASE_DIR, "./src/background.mp3")
-if os.path.exists(bg_music_path):
-    pygame.mixer.music.load(bg_music_path)
-    pygame.mixer.music.set_volume(0.2)
-    pygame.mixer.music.play(-1)
-else:
-    print("[WARNING] Background music not found. Skipping.")
+# Set MINESWEEPER_TRACE_TK=1 to print how many Tk widget calls each move costs
+TRACE_TK = os.environ.get("MINESWEEPER_TRACE_TK") == "1"
 
 # =================== GUI CLASS ========================
 
@@ -110,8 +102,156 @@ class StartScreen(tk.Frame):
         self.destroy()
 
 
+class ButtonBoard:
+    # One tk.Button per cell, rebuilt on every reset
+    def __init__(self, app, parent):
+        self.app = app
+        self.parent = parent
+        self.buttons = {}
+
+    def build(self, rows, cols):
+        for widget in self.parent.winfo_children():
+            widget.destroy()
+        self.buttons = {}
+
+        for r in range(rows):
+            self.parent.grid_rowconfigure(r, weight=1)
+        for c in range(cols):
+            self.parent.grid_columnconfigure(c, weight=1)
+
+        cell_font = ("Consolas", 16, "bold")
+        cell_width = 3
+        cell_height = 1
+
+        for r in range(rows):
+            for c in range(cols):
+                btn = tk.Button(
+                    self.parent,
+                    font=cell_font,
+                    width=cell_width,
+                    height=cell_height,
+                    bg=COLOR_CELL_UNREVEALED,
+                    fg=COLOR_BTN_FG,
+                    relief=tk.RAISED,
+                    activebackground=COLOR_ACCENT,
+                    activeforeground=COLOR_BG,
+                    command=lambda x=r, y=c: self.app.on_left_click(x, y)
+                )
+                btn.bind("<Button-3>", lambda e, x=r, y=c: self.app.on_right_click(x, y))
+                btn.bind("<Button-2>", lambda e, x=r, y=c: self.app.on_chord(x, y))
+                btn.bind("<Double-Button-1>", lambda e, x=r, y=c: self.app.on_chord(x, y))
+                btn.grid(row=r, column=c, sticky="nsew", padx=1, pady=1)
+                self.buttons[(r, c)] = btn
+
+    def paint(self, game, changed):
+        # Returns the number of Tk calls made
+        cols = game.cols
+        for i in changed:
+            r, c = divmod(i, cols)
+            self.paint_button(self.buttons[(r, c)], game.board[r][c])
+        return len(changed)
+
+    def paint_button(self, btn, cell):
+        if cell.revealed:
+            if cell.is_mine:
+                btn.config(relief=tk.SUNKEN, state=tk.DISABLED, bg=COLOR_CELL_REVEALED, fg=COLOR_ACCENT, borderwidth=1,
+                           highlightbackground=COLOR_ACCENT, text="💣", disabledforeground=COLOR_MINE)
+            elif cell.adjacent_mines > 0:
+                btn.config(relief=tk.SUNKEN, state=tk.DISABLED, bg=COLOR_CELL_REVEALED, borderwidth=1,
+                           highlightbackground=COLOR_ACCENT, text=str(cell.adjacent_mines),
+                           fg=self.app.get_color(cell.adjacent_mines))
+            else:
+                btn.config(relief=tk.SUNKEN, state=tk.DISABLED, bg=COLOR_CELL_REVEALED, fg=COLOR_ACCENT, borderwidth=1,
+                           highlightbackground=COLOR_ACCENT, text="")
+        else:
+            if cell.flagged:
+                btn.config(text="🚩", fg=COLOR_FLAG, bg=COLOR_CELL_UNREVEALED)
+            else:
+                btn.config(text="", fg=COLOR_ACCENT, bg=COLOR_CELL_UNREVEALED)
+
+    def disable(self):
+        for btn in self.buttons.values():
+            btn.config(state=tk.DISABLED)
+        return len(self.buttons)
+
+
+class CanvasBoard:
+    # A single tk.Canvas with one rectangle and one text item per cell.
+    # Items are kept across resets and only recreated when the board size changes.
+    def __init__(self, app, parent):
+        self.app = app
+        self.canvas = tk.Canvas(parent, bg=COLOR_PANEL, highlightthickness=0)
+        self.canvas.pack()
+        self.canvas.bind("<Button-1>", lambda e: self.on_click(e, self.app.on_left_click))
+        self.canvas.bind("<Button-3>", lambda e: self.on_click(e, self.app.on_right_click))
+        self.canvas.bind("<Button-2>", lambda e: self.on_click(e, self.app.on_chord))
+        self.canvas.bind("<Double-Button-1>", lambda e: self.on_click(e, self.app.on_chord))
+        self.rows = self.cols = 0
+        self.size = 0
+        self.rects = []
+        self.texts = []
+
+    def build(self, rows, cols):
+        if (rows, cols) == (self.rows, self.cols):
+            # Same geometry: reset every item with two tag-wide calls
+            self.canvas.itemconfig("cell", fill=COLOR_CELL_UNREVEALED, outline=COLOR_PANEL)
+            self.canvas.itemconfig("label", text="")
+            return
+        self.canvas.delete("all")
+        self.rows, self.cols = rows, cols
+        self.size = size = max(12, min(40, 560 // max(rows, cols)))
+        self.canvas.config(width=cols * size, height=rows * size)
+        font = ("Consolas", max(6, size * 2 // 5), "bold")
+        self.rects = []
+        self.texts = []
+        for r in range(rows):
+            y = r * size
+            for c in range(cols):
+                x = c * size
+                self.rects.append(self.canvas.create_rectangle(
+                    x + 1, y + 1, x + size - 1, y + size - 1,
+                    fill=COLOR_CELL_UNREVEALED, outline=COLOR_PANEL, tags="cell"))
+                self.texts.append(self.canvas.create_text(
+                    x + size // 2, y + size // 2, text="", font=font, tags="label"))
+
+    def on_click(self, event, handler):
+        r, c = event.y // self.size, event.x // self.size
+        if 0 <= r < self.rows and 0 <= c < self.cols:
+            handler(r, c)
+
+    def paint(self, game, changed):
+        itemconfig = self.canvas.itemconfig
+        board = game.board
+        cols = game.cols
+        for i in changed:
+            r, c = divmod(i, cols)
+            cell = board[r][c]
+            if cell.revealed:
+                itemconfig(self.rects[i], fill=COLOR_CELL_REVEALED, outline=COLOR_ACCENT)
+                if cell.is_mine:
+                    itemconfig(self.texts[i], text="💣", fill=COLOR_MINE)
+                elif cell.adjacent_mines > 0:
+                    itemconfig(self.texts[i], text=str(cell.adjacent_mines), fill=self.app.get_color(cell.adjacent_mines))
+                else:
+                    itemconfig(self.texts[i], text="")
+            else:
+                itemconfig(self.rects[i], fill=COLOR_CELL_UNREVEALED, outline=COLOR_PANEL)
+                itemconfig(self.texts[i], text="🚩" if cell.flagged else "", fill=COLOR_FLAG)
+        return 2 * len(changed)
+
+    def disable(self):
+        # Clicks are already ignored once the game is over
+        return 0
+
+
+RENDERERS = {
+    "button": ButtonBoard,
+    "canvas": CanvasBoard,
+}
+
+
 class MinesweeperApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, renderer="button", sound=True, no_guess=False):
         super().__init__()
         self.title("Minesweeper Interactive")
         self.geometry("650x720")
@@ -119,21 +259,33 @@ class MinesweeperApp(tk.Tk):
         self.configure(bg=COLOR_BG)
 
         self.player_name = None
+        # Audio starts on its own thread; the window does not wait for it
+        self.sound = SoundManager(BASE_DIR, enabled=sound)
 
-        self.levels = {
-            "Easy": (9, 9, 10, None),
-            "Medium": (16, 16, 40, None),
-            "Hard": (24, 24, 99, None),
-            "Time Challenge": (16, 16, 40, 120),
-            "Expert": (24, 24, 99, 60)
-        }
+        self.levels = dict(LEVELS)
         self.current_level = "Easy"
         self.game = None
-        self.buttons = {}
+        self.renderer = renderer
+        self.board_view = None
         self.start_time = None
         self.elapsed_time = 0
         self.timer_running = False
+        # Pending after() call of update_timer, cancelled whenever the timer stops
+        self.timer_job = None
         self.score = 0
+        self.tk_calls = 0
+        # Cell opened by the last left click, so the second half of a
+        # double-click on a hidden cell does not chord straight away
+        self.last_reveal = None
+        # Every reset and move of the session; resumed saves are not recorded
+        # because their first click is not known
+        self.move_log = MoveLog()
+        self.recording = False
+        # Pre-generated boards that never need a guess, topped up by worker processes
+        self.board_pool = BoardPool(level_configs(self.levels), NOGUESS_PATH).start() if no_guess else None
+        # Timings and counters, None unless instrumentation is on (--stats or MINESWEEPER_STATS=1)
+        self.stats = instrument.STATS
+        self.last_tick = None
 
         style = ttk.Style()
         style.theme_use('default')
@@ -141,6 +293,8 @@ class MinesweeperApp(tk.Tk):
         style.configure("red.Horizontal.TProgressbar", troughcolor=COLOR_PROGRESS_BG, background=COLOR_PROGRESS_DANGER)
 
         self.start_screen = StartScreen(self, self.start_game, self.show_leaderboard, self.show_about)
+        # The window's close button gets the same shutdown as the Quit button
+        self.protocol("WM_DELETE_WINDOW", self.quit_game)
 
     def show_about(self):
         messagebox.showinfo(
@@ -193,6 +347,7 @@ class MinesweeperApp(tk.Tk):
         # Board Frame
         self.board_frame = tk.Frame(self, bg=COLOR_PANEL, bd=8, relief=tk.RIDGE, highlightbackground=COLOR_ACCENT, highlightthickness=2)
         self.board_frame.pack(pady=15, padx=15)
+        self.board_view = RENDERERS[self.renderer](self, self.board_frame)
 
         # Bottom buttons frame
         btn_frame = tk.Frame(self, bg=COLOR_BG)
@@ -217,8 +372,21 @@ class MinesweeperApp(tk.Tk):
         self.quit_button.bind("<Leave>", lambda e: self.quit_button.config(bg=COLOR_DANGER))
 
         self.bind('<r>', lambda e: self.reset_game())
+        self.bind('<Control-s>', lambda e: self.save_current_game())
+        self.bind('<Control-o>', lambda e: self.resume_saved_game())
+        self.bind('<F12>', lambda e: self.show_stats())
 
     def quit_game(self):
+        # Queued scores are flushed by the leaderboard's atexit hook
+        self.write_replay()
+        self.sound.close()
+        if self.board_pool is not None:
+            self.board_pool.close()
+        if self.stats is not None:
+            try:
+                self.stats.dump(STATS_PATH)
+            except OSError as e:
+                print(f"[ERROR] Failed to write stats: {e}")
         self.destroy()
 
     def change_level(self, event):
@@ -226,40 +394,16 @@ class MinesweeperApp(tk.Tk):
         self.reset_game()
 
     def reset_game(self):
-        if self.timer_running:
-            self.timer_running = False
-        for widget in self.board_frame.winfo_children():
-            widget.destroy()
+        self.stop_timer()
         rows, cols, mines, self.time_limit = self.levels[self.current_level]
         self.game = MinesweeperGame(rows, cols, mines)
-        self.buttons = {}
-
-        for r in range(rows):
-            self.board_frame.grid_rowconfigure(r, weight=1)
-        for c in range(cols):
-            self.board_frame.grid_columnconfigure(c, weight=1)
-
-        cell_font = ("Consolas", 16, "bold")
-        cell_width = 3
-        cell_height = 1
-
-        for r in range(rows):
-            for c in range(cols):
-                btn = tk.Button(
-                    self.board_frame,
-                    font=cell_font,
-                    width=cell_width,
-                    height=cell_height,
-                    bg=COLOR_CELL_UNREVEALED,
-                    fg=COLOR_BTN_FG,
-                    relief=tk.RAISED,
-                    activebackground=COLOR_ACCENT,
-                    activeforeground=COLOR_BG,
-                    command=lambda x=r, y=c: self.on_left_click(x, y)
-                )
-                btn.bind("<Button-3>", lambda e, x=r, y=c: self.on_right_click(x, y))
-                btn.grid(row=r, column=c, sticky="nsew", padx=1, pady=1)
-                self.buttons[(r, c)] = btn
+        self.move_log.reset(self.game, self.current_level)
+        self.recording = True
+        build_start = time.perf_counter()
+        self.board_view.build(rows, cols)
+        if TRACE_TK:
+            print(f"[TK] {self.renderer} reset {rows}x{cols}: {time.perf_counter() - build_start:.3f}s")
+        self.game.pop_changed()
 
         self.start_time = time.time()
         self.elapsed_time = 0
@@ -267,22 +411,116 @@ class MinesweeperApp(tk.Tk):
         self.update_score(0)
         self.update_info_label()
         self.timer_running = True
+        self.last_tick = None
         self.update_timer()
         self.reset_button.focus_set()
 
+    def save_current_game(self):
+        if self.game is None or self.game.is_game_over:
+            return
+        try:
+            save_game(self.game, SAVE_PATH, elapsed=self.elapsed_time, score=self.score, level=self.current_level)
+        except OSError as e:
+            messagebox.showerror("Save Failed", f"Could not save the game: {e}")
+            return
+        messagebox.showinfo("Game Saved", "Press Ctrl+O to resume it later.")
+
+    def resume_saved_game(self):
+        try:
+            saved = load_game(SAVE_PATH)
+        except FileNotFoundError:
+            messagebox.showinfo("Resume", "There is no saved game yet.")
+            return
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Resume Failed", f"Could not load the saved game: {e}")
+            return
+        if saved.game.is_game_over:
+            return
+        self.stop_timer()
+        self.recording = False
+        self.game = saved.game
+        if saved.level in self.levels:
+            self.current_level = saved.level
+            self.level_var.set(saved.level)
+            self.time_limit = self.levels[saved.level][3]
+        else:
+            self.time_limit = None
+        self.board_view.build(self.game.rows, self.game.cols)
+        self.game.pop_changed()
+        # A fresh board already shows hidden cells; paint only the ones that differ
+        revealed_map, flagged_map = self.game.revealed_map, self.game.flagged_map
+        self.update_buttons({i for i in range(self.game.rows * self.game.cols) if revealed_map[i] or flagged_map[i]})
+
+        self.start_time = time.time() - saved.elapsed
+        self.elapsed_time = int(saved.elapsed)
+        self.score = saved.score
+        self.update_score(0)
+        self.update_info_label()
+        self.timer_running = True
+        self.last_tick = None
+        self.update_timer()
+        self.report_tk_calls("resume")
+
+    def use_pool_board(self, x, y):
+        game = self.game
+        layout = self.board_pool.take(game.rows, game.cols, game.mines, x, y)
+        if layout is None:
+            print(f"[WARNING] No no-guess board ready for {self.current_level}; using a random board")
+            return
+        game.place_layout(layout)
+        # The replay log rebuilds boards from their seed, which a pooled layout does not
+        # follow: drop this game's reset and any flags placed before the first click
+        if self.recording:
+            self.move_log.drop_game()
+            self.recording = False
+
+    def record_move(self, kind, x, y):
+        if self.recording:
+            self.move_log.record(kind, x * self.game.cols + y)
+
+    def write_replay(self):
+        if not self.move_log:
+            return
+        try:
+            self.move_log.save(REPLAY_PATH)
+        except OSError as e:
+            print(f"[ERROR] Failed to save replay: {e}")
+
     def update_score(self, add_points):
         self.score += add_points
         if self.score < 0:
             self.score = 0
         self.score_label.config(text=f"⭐ Score: {self.score}")
+        self.tk_calls += 1
 
     def update_info_label(self):
-        mines_left = self.game.mines - sum(1 for row in self.game.board for cell in row if cell.flagged)
-        self.info_label.config(text=f"Mines: {self.game.mines} | Flags Left: {mines_left}")
+        self.info_label.config(text=f"Mines: {self.game.mines} | Flags Left: {self.game.mines_remaining}")
+        self.tk_calls += 1
+
+    def report_tk_calls(self, move):
+        if TRACE_TK:
+            print(f"[TK] {move}: {self.tk_calls} Tk calls")
+        if self.stats is not None:
+            self.stats.count("moves")
+            self.stats.count("tk_calls", self.tk_calls)
+        self.tk_calls = 0
+
+    def show_stats(self):
+        if self.stats is None:
+            messagebox.showinfo("Stats", "Instrumentation is off. Start with --stats or MINESWEEPER_STATS=1.")
+            return
+        messagebox.showinfo("Stats", self.stats.format())
 
     def update_timer(self):
+        self.timer_job = None
         if not self.timer_running:
             return
+        if self.stats is not None:
+            # How late this tick is against the 1s schedule
+            now = time.monotonic()
+            if self.last_tick is not None:
+                self.stats.record("timer_drift_ms", (now - self.last_tick - 1.0) * 1000)
+            self.last_tick = now
         self.elapsed_time = int(time.time() - self.start_time)
         self.timer_label.config(text=f"⏰ Time: {format_time(self.elapsed_time)}")
 
@@ -295,6 +533,7 @@ class MinesweeperApp(tk.Tk):
                 self.progress_bar.config(style="blue.Horizontal.TProgressbar")
             if self.elapsed_time >= self.time_limit:
                 self.timer_running = False
+                self.record_move(TIMEOUT, 0, 0)
                 self.game.is_game_over = True
                 self.game.is_win = False
                 self.reveal_all()
@@ -303,7 +542,13 @@ class MinesweeperApp(tk.Tk):
         else:
             self.progress_var.set(0)
 
-        self.after(1000, self.update_timer)
+        self.timer_job = self.after(1000, self.update_timer)
+
+    def stop_timer(self):
+        self.timer_running = False
+        if self.timer_job is not None:
+            self.after_cancel(self.timer_job)
+            self.timer_job = None
 
     def on_left_click(self, x, y):
         if self.game.is_game_over:
@@ -311,37 +556,66 @@ class MinesweeperApp(tk.Tk):
         cell = self.game.board[x][y]
         if cell.flagged or cell.revealed:
             return
-        if click_sound:
-            click_sound.play()
-        self.game.reveal_cell(x, y)
+        if self.board_pool is not None and not self.game.mines_placed:
+            self.use_pool_board(x, y)
+        stats = self.stats
+        if stats is None:
+            self.game.reveal_cell(x, y)
+        else:
+            start = time.perf_counter()
+            opened = self.game.reveal_cell(x, y)
+            stats.record("reveal_ms", (time.perf_counter() - start) * 1000)
+            stats.record("flood_cells", len(opened))
+        self.record_move(REVEAL, x, y)
+        self.sound.play("click")
+        self.last_reveal = (x, y, time.monotonic())
         # Award points for revealing a safe cell (optional, e.g. +1 for each safe cell revealed)
         if not cell.is_mine and not cell.flagged:
             self.update_score(1)
+        self.finish_move(f"reveal ({x}, {y})")
+
+    def on_chord(self, x, y):
+        if self.game.is_game_over:
+            return
+        if self.last_reveal and self.last_reveal[:2] == (x, y) and time.monotonic() - self.last_reveal[2] < 0.5:
+            return
+        opened = self.game.chord(x, y)
+        if not opened:
+            return
+        self.record_move(CHORD, x, y)
+        self.sound.play("click")
+        if not self.game.is_game_over or self.game.is_win:
+            self.update_score(1)
+        self.finish_move(f"chord ({x}, {y})")
+
+    def finish_move(self, move):
+        # One repaint per move, then the end-of-game handling
         self.update_buttons()
         self.update_info_label()
         if self.game.is_game_over:
             if self.game.is_win:
-                if win_sound:
-                    win_sound.play()
+                self.sound.play("win")
+                self.report_tk_calls(move)
                 self.game_over(True)
             else:
-                if explosion_sound:
-                    explosion_sound.play()
+                self.sound.play("explosion")
                 self.reveal_all()
+                self.report_tk_calls(move)
                 self.game_over(False)
+            return
+        self.report_tk_calls(move)
 
     def on_right_click(self, x, y):
         if self.game.is_game_over:
             return
-        cell = self.game.board[x][y]
-        if cell.revealed:
+        flagged = self.game.toggle_flag(x, y)
+        if flagged is None:
             return
-        cell.toggle_flag()
-        if click_sound:
-            click_sound.play()
+        self.record_move(FLAG, x, y)
+        self.sound.play("click")
         # Scoring logic: +5 for correct flag, -2 for incorrect flag, 0 for unflagging
-        if cell.flagged:
-            if cell.is_mine:
+        if flagged:
+            if self.game.board[x][y].is_mine:
                 self.update_score(5)
             else:
                 self.update_score(-2)
@@ -350,27 +624,20 @@ class MinesweeperApp(tk.Tk):
             pass
         self.update_buttons()
         self.update_info_label()
+        self.report_tk_calls(f"flag ({x}, {y})")
+
+    def update_buttons(self, changed=None):
+        # Repaint only the cells the game reports as changed since the last repaint
+        if changed is None:
+            changed = self.game.pop_changed()
+        if self.stats is None:
+            self.tk_calls += self.board_view.paint(self.game, changed)
+            return
+        start = time.perf_counter()
+        self.tk_calls += self.board_view.paint(self.game, changed)
+        self.stats.record("repaint_ms", (time.perf_counter() - start) * 1000)
+        self.stats.record("repaint_cells", len(changed))
 
-    def update_buttons(self):
-        cell_font = ("Consolas", 16, "bold")
-        cell_width = 3
-        cell_height = 1
-        for (r, c), btn in self.buttons.items():
-            cell = self.game.board[r][c]
-            btn.config(font=cell_font, width=cell_width, height=cell_height)  # Enforce size/font always
-            if cell.revealed:
-                btn.config(relief=tk.SUNKEN, state=tk.DISABLED, bg=COLOR_CELL_REVEALED, fg=COLOR_ACCENT, borderwidth=1, highlightbackground=COLOR_ACCENT)
-                if cell.is_mine:
-                    btn.config(text="💣", disabledforeground=COLOR_MINE, bg=COLOR_CELL_REVEALED)
-                elif cell.adjacent_mines > 0:
-                    btn.config(text=str(cell.adjacent_mines), fg=self.get_color(cell.adjacent_mines), bg=COLOR_CELL_REVEALED)
-                else:
-                    btn.config(text="", bg=COLOR_CELL_REVEALED)
-            else:
-                if cell.flagged:
-                    btn.config(text="🚩", fg=COLOR_FLAG, bg=COLOR_CELL_UNREVEALED)
-                else:
-                    btn.config(text="", fg=COLOR_ACCENT, bg=COLOR_CELL_UNREVEALED)
     def get_color(self, number):
         colors = {
             1: "#61afef",  # blue
@@ -385,15 +652,13 @@ class MinesweeperApp(tk.Tk):
         return colors.get(number, COLOR_ACCENT)
 
     def reveal_all(self):
-        for r in range(self.game.rows):
-            for c in range(self.game.cols):
-                self.game.board[r][c].revealed = True
+        self.game.reveal_all()
         self.update_buttons()
 
     def game_over(self, win, timeout=False):
-        self.timer_running = False
-        for btn in self.buttons.values():
-            btn.config(state=tk.DISABLED)
+        self.stop_timer()
+        self.write_replay()
+        self.tk_calls += self.board_view.disable()
 
         if win:
             msg = f"Congratulations {self.player_name}! You Win!\nYour score: {self.score}\nTime: {format_time(self.elapsed_time)}"
@@ -403,14 +668,21 @@ class MinesweeperApp(tk.Tk):
             else:
                 msg = f"You hit a mine! Game Over.\nYour score: {self.score}"
 
-        # Kirim juga level dan durasi ke add_score
-        add_score(self.player_name, self.score, self.current_level, self.elapsed_time)
+        # Kirim juga level dan durasi ke leaderboard; written on a background thread
+        try:
+            get_cache().add(self.player_name, self.score, self.current_level, self.elapsed_time)
+        except sqlite3.Error as e:
+            print(f"[ERROR] Failed to save score: {e}")
 
         messagebox.showinfo("Game Over", msg)
         self.show_leaderboard()
 
     def show_leaderboard(self):
-        scores = load_leaderboard()
+        try:
+            scores = get_cache().top()
+        except sqlite3.Error as e:
+            print(f"[ERROR] Failed to load leaderboard: {e}")
+            scores = []
         text = "Leaderboard (Top 10 Scores):\n\n"
         if not scores:
             text += "No scores yet."
@@ -426,5 +698,20 @@ class MinesweeperApp(tk.Tk):
         messagebox.showinfo("Leaderboard", text)
 
 if __name__ == "__main__":
-    app = MinesweeperApp()
-    app.mainloop()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Minesweeper Interactive")
+    parser.add_argument("--renderer", choices=list(RENDERERS), default="button",
+                        help="board widget: one button per cell, or a single canvas")
+    parser.add_argument("--no-sound", action="store_true", help="start without audio")
+    parser.add_argument("--no-guess", action="store_true",
+                        help="deal boards that can be cleared without guessing")
+    parser.add_argument("--stats", action="store_true",
+                        help=f"record move, repaint, timer and leaderboard timings (F12 shows them, "
+                             f"written to {os.path.basename(STATS_PATH)} on quit)")
+    parser.add_argument("--profile", metavar="PATH", help="write cProfile stats of the session to PATH")
+    parser.add_argument("--sample", metavar="PATH",
+                        help="sample the main thread's stack and write folded stacks to PATH")
+    args = parser.parse_args()
+    if args.stats:
+        instrument.enable()
+    app = MinesweeperApp(renderer=args.renderer, sound=not args.no_sound, no_guess=args.no_guess)
+    instrument.profile_call(app.mainloop, args.profile, args.sample)
\ No newline at end of file
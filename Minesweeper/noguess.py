@@ -0,0 +1,333 @@
+# noguess.py
+# Boards that can be cleared from the first click without guessing, and a
+# bounded pool of them filled by worker processes in the background.
+#
+# A board is accepted when the Solver, revealing only cells it has proven
+# safe, wins from the first click. Clicks that map onto each other under the
+# board's symmetries (flips, plus rotations on square boards) form one
+# position class; boards are generated for the class's canonical cell and
+# flipped/rotated onto the cell the player actually clicked, so a 24x24 board
+# needs 78 classes instead of 576 cells.
+#
+# Ready boards sit in memory (a few per class) with an overflow in SQLite
+# (bounded per class), so starting a no-guess game never waits on generation.
+#
+#   python noguess.py --levels Easy Expert --fill
+
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import closing
+
+from game import LEVELS, MinesweeperGame
+from savefile import pack_bits, unpack_bits
+from solver import Solver
+
+DEFAULT_PATH = "noguess.db"
+# Give up on a class after this many layouts in one task; the next task tries new seeds
+MAX_ATTEMPTS = 500
+# Seconds between checks for close() while waiting on worker results
+STOP_POLL = 0.1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS boards (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    rows INTEGER NOT NULL,
+    cols INTEGER NOT NULL,
+    mines INTEGER NOT NULL,
+    r INTEGER NOT NULL,
+    c INTEGER NOT NULL,
+    layout BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS boards_class ON boards (rows, cols, mines, r, c);
+"""
+
+
+def solvable(game, r, c):
+    # Plays (r, c) and then only certain moves; True if that wins
+    game.reveal_cell(r, c)
+    solver = Solver(game)
+    while not game.is_game_over:
+        move = solver.next_move()
+        if move is None or move[3] != 0.0:
+            return False
+        game.reveal_cell(move[1], move[2])
+        solver.update(game.pop_changed())
+    return game.is_win
+
+
+def generate(rows, cols, mines, r, c, seed, attempts=MAX_ATTEMPTS):
+    # Packed mine layout of the first no-guess board from seed on, or None
+    for s in range(seed, seed + attempts):
+        game = MinesweeperGame(rows, cols, mines, seed=s)
+        if solvable(game, r, c):
+            return pack_bits(game.mine_map)
+    return None
+
+
+def _generate_task(task):
+    rows, cols, mines, r, c, seed = task
+    return (rows, cols, mines, r, c), generate(rows, cols, mines, r, c, seed)
+
+
+class Symmetry:
+    # Position classes of one board size and the cell permutations between them
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        last_r, last_c = rows - 1, cols - 1
+        transforms = [
+            lambda r, c: (r, c),
+            lambda r, c: (last_r - r, c),
+            lambda r, c: (r, last_c - c),
+            lambda r, c: (last_r - r, last_c - c),
+        ]
+        if rows == cols:
+            transforms += [
+                lambda r, c: (c, r),
+                lambda r, c: (last_c - c, r),
+                lambda r, c: (c, last_r - r),
+                lambda r, c: (last_c - c, last_r - r),
+            ]
+        self.transforms = transforms
+        self._permutations = {}
+        # cell -> (canonical cell, transform taking the canonical cell to it)
+        self.classes = {}
+        for r in range(rows):
+            for c in range(cols):
+                canonical = min(t(r, c) for t in transforms)
+                k = next(k for k, t in enumerate(transforms) if t(*canonical) == (r, c))
+                self.classes[(r, c)] = canonical, k
+
+    def canonical_cells(self):
+        return sorted({canonical for canonical, _ in self.classes.values()})
+
+    def _permutation(self, k):
+        permutation = self._permutations.get(k)
+        if permutation is None:
+            t, cols = self.transforms[k], self.cols
+            permutation = self._permutations[k] = [
+                nr * cols + nc for nr, nc in (t(*divmod(i, cols)) for i in range(self.rows * cols))]
+        return permutation
+
+    def orient(self, layout, r, c):
+        # A layout made for the canonical cell of (r, c), moved so (r, c) is the safe click
+        _, k = self.classes[(r, c)]
+        if k == 0:
+            return bytearray(layout)
+        oriented = bytearray(len(layout))
+        for i, j in enumerate(self._permutation(k)):
+            oriented[j] = layout[i]
+        return oriented
+
+
+class BoardPool:
+    def __init__(self, configs, path=DEFAULT_PATH, memory_per_class=2, disk_per_class=8, workers=None):
+        # configs: (rows, cols, mines) per level; duplicates are fine
+        self.path = path
+        self.memory_per_class = memory_per_class
+        self.disk_per_class = disk_per_class
+        self.workers = workers or os.cpu_count() or 1
+        self.symmetries = {}
+        self.memory = {}      # (rows, cols, mines, r, c) -> deque of packed layouts
+        self.on_disk = {}     # same key -> boards stored in SQLite
+        for rows, cols, mines in configs:
+            symmetry = self.symmetries.setdefault((rows, cols), Symmetry(rows, cols))
+            for r, c in symmetry.canonical_cells():
+                self.memory.setdefault((rows, cols, mines, r, c), deque())
+                self.on_disk[(rows, cols, mines, r, c)] = 0
+        self.generated = 0
+        self.served = 0
+        self.missed = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = None
+        self._seed = random.getrandbits(48)
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def _init_db(self):
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(_SCHEMA)
+            for rows, cols, mines, r, c, count in conn.execute(
+                    "SELECT rows, cols, mines, r, c, COUNT(*) FROM boards GROUP BY rows, cols, mines, r, c"):
+                if (rows, cols, mines, r, c) in self.on_disk:
+                    self.on_disk[(rows, cols, mines, r, c)] = count
+
+    def _missing(self):
+        # Classes below their target, with how many boards each still needs
+        target = self.memory_per_class + self.disk_per_class
+        with self._lock:
+            return {key: target - len(boards) - self.on_disk[key]
+                    for key, boards in self.memory.items()
+                    if len(boards) + self.on_disk[key] < target}
+
+    def _tasks(self, missing):
+        for key, count in missing.items():
+            for _ in range(count):
+                self._seed += MAX_ATTEMPTS
+                yield key + (self._seed,)
+
+    def _store(self, key, layout):
+        with self._lock:
+            boards = self.memory[key]
+            if len(boards) < self.memory_per_class:
+                boards.append(layout)
+                self.generated += 1
+                return
+            if self.on_disk[key] >= self.disk_per_class:
+                return
+            self.on_disk[key] += 1
+            self.generated += 1
+        with closing(self._connect()) as conn, conn:
+            conn.execute("INSERT INTO boards (rows, cols, mines, r, c, layout) VALUES (?, ?, ?, ?, ?, ?)",
+                         key + (layout,))
+
+    def fill(self):
+        # Generates until every class is at its target (blocking)
+        while not self._stopped:
+            missing = self._missing()
+            if not missing:
+                return
+            # spawn, not fork: the pool is started from a thread of the Tk process
+            with multiprocessing.get_context("spawn").Pool(self.workers) as pool:
+                results = pool.imap_unordered(_generate_task, self._tasks(missing))
+                while True:
+                    # A Hard board can take seconds; wait in short steps so close()
+                    # cancels the tasks in flight instead of waiting them out
+                    try:
+                        key, layout = results.next(STOP_POLL)
+                    except multiprocessing.TimeoutError:
+                        if self._stopped:
+                            pool.terminate()
+                            return
+                        continue
+                    except StopIteration:
+                        break
+                    if layout is not None:
+                        self._store(key, layout)
+                    if self._stopped:
+                        pool.terminate()
+                        return
+
+    def _run(self):
+        while not self._stopped:
+            try:
+                self.fill()
+            except (OSError, sqlite3.Error) as e:
+                print(f"[ERROR] No-guess board generation failed: {e}")
+                return
+            self._wake.wait()
+            self._wake.clear()
+
+    def start(self):
+        # Keeps the pool topped up on a background thread
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="noguess-pool", daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self):
+        # Stops the filler, terminating the workers' boards in flight. Boards
+        # still held in memory are written to SQLite, up to disk_per_class, so
+        # the next run can use them.
+        self._stopped = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        rows = []
+        with self._lock:
+            for key, boards in self.memory.items():
+                keep = list(boards)[:max(0, self.disk_per_class - self.on_disk[key])]
+                rows += [key + (layout,) for layout in keep]
+                self.on_disk[key] += len(keep)
+                boards.clear()
+        if not rows:
+            return
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.executemany("INSERT INTO boards (rows, cols, mines, r, c, layout) VALUES (?, ?, ?, ?, ?, ?)",
+                                 rows)
+        except sqlite3.Error as e:
+            print(f"[ERROR] Failed to save the no-guess pool: {e}")
+
+    def _take_from_disk(self, key):
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT id, layout FROM boards WHERE rows = ? AND cols = ? AND mines = ? "
+                               "AND r = ? AND c = ? LIMIT 1", key).fetchone()
+            if row is None:
+                return None
+            conn.execute("DELETE FROM boards WHERE id = ?", (row[0],))
+        with self._lock:
+            self.on_disk[key] -= 1
+        return row[1]
+
+    def take(self, rows, cols, mines, r, c):
+        # Mine plane for a no-guess game whose first click is (r, c), or None
+        # when the pool has nothing ready for that position class
+        symmetry = self.symmetries.get((rows, cols))
+        if symmetry is None:
+            return None
+        (cr, cc), _ = symmetry.classes[(r, c)]
+        key = (rows, cols, mines, cr, cc)
+        if key not in self.memory:
+            return None
+        with self._lock:
+            boards = self.memory[key]
+            layout = boards.popleft() if boards else None
+        if layout is None:
+            try:
+                layout = self._take_from_disk(key)
+            except sqlite3.Error as e:
+                print(f"[ERROR] Failed to read the no-guess pool: {e}")
+        self._wake.set()
+        if layout is None:
+            self.missed += 1
+            return None
+        self.served += 1
+        return symmetry.orient(unpack_bits(layout, rows * cols), r, c)
+
+    def ready(self):
+        with self._lock:
+            return sum(len(boards) + self.on_disk[key] for key, boards in self.memory.items())
+
+
+def level_configs(levels, names=None):
+    # (rows, cols, mines) of the chosen presets, each size once
+    return sorted({levels[name][:3] for name in (names or levels)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill the no-guess board pool")
+    parser.add_argument("--levels", nargs="*", default=list(LEVELS), help="level presets to generate for")
+    parser.add_argument("--path", default=DEFAULT_PATH)
+    parser.add_argument("--per-class", type=int, default=8, help="boards kept on disk per position class")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--fill", action="store_true", help="generate until the pool is full")
+    args = parser.parse_args()
+    unknown = [name for name in args.levels if name not in LEVELS]
+    if unknown:
+        parser.error(f"unknown level(s): {', '.join(unknown)}")
+    pool = BoardPool(level_configs(LEVELS, args.levels), args.path, memory_per_class=0,
+                     disk_per_class=args.per_class, workers=args.workers)
+    before = pool.ready()
+    if args.fill:
+        start = time.perf_counter()
+        pool.fill()
+        elapsed = time.perf_counter() - start
+        print(f"Generated {pool.generated} boards in {elapsed:.1f}s "
+              f"({pool.generated / elapsed if elapsed else 0:.1f} boards/s, {pool.workers} workers)")
+    print(f"{pool.ready()} boards ready in {args.path} ({before} before), {len(pool.memory)} position classes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+# probability.py
+# Exact mine probabilities for every hidden cell, from the player-visible state.
+#
+# The solver's constraints are split into independent components (frontier
+# cells linked through shared constraints). Each component is enumerated once
+# and summarised as "number of solutions with m mines" plus, per cell, how many
+# of those solutions mine it. Components are cached by their constraint set, so
+# after a move only the components the reveal touched are enumerated again.
+# The cells off the frontier are weighted with a memoized binomial count.
+
+from collections import deque
+from functools import lru_cache
+from math import comb
+
+from solver import Solver
+
+
+@lru_cache(maxsize=4096)
+def _interior_ways(cells, mines):
+    if mines < 0 or mines > cells:
+        return 0
+    return comb(cells, mines)
+
+
+def _poly_mul(a, b):
+    # Polynomials in "number of mines" as {mines: count}
+    out = {}
+    for i, x in a.items():
+        for j, y in b.items():
+            out[i + j] = out.get(i + j, 0) + x * y
+    return out
+
+
+def _poly_add(into, poly, shift=0):
+    for m, count in poly.items():
+        into[m + shift] = into.get(m + shift, 0) + count
+
+
+class Component:
+    # Enumerates one component with a memoized sweep over its cells: the state
+    # after each cell is the remaining need of the constraints still open, so
+    # long frontier chains stay polynomial instead of 2^cells.
+    def __init__(self, cells, constraints):
+        self.cells = cells              # ordered frontier cells
+        self.constraints = constraints  # list of (need, cells) with cells a frozenset
+        self.totals = {}                # mines -> number of solutions
+        self.per_cell = {}              # cell -> {mines: solutions mining that cell}
+        self._enumerate()
+
+    def _enumerate(self):
+        cells = self.cells
+        n = len(cells)
+        pos = {cell: p for p, cell in enumerate(cells)}
+        first, last, members = [], [], []
+        for need, group in self.constraints:
+            positions = sorted(pos[x] for x in group)
+            first.append(positions[0])
+            last.append(positions[-1])
+            members.append(set(positions))
+        # Constraints open across each boundary, and which constraints each cell feeds
+        open_at = [[k for k in range(len(first)) if first[k] < p <= last[k]] for p in range(n + 1)]
+        touches = [[k for k in range(len(first)) if p in members[k]] for p in range(n)]
+        left_after = [[sum(1 for q in members[k] if q > p) for k in range(len(first))] for p in range(n)]
+        needs = [need for need, _ in self.constraints]
+
+        def step(p, state, value):
+            current = dict(zip(open_at[p], state))
+            for k in touches[p]:
+                remaining = current.get(k, needs[k]) - value
+                if remaining < 0 or remaining > left_after[p][k]:
+                    return None
+                current[k] = remaining
+            return tuple(current[k] for k in open_at[p + 1])
+
+        forward = [{(): {0: 1}}]
+        for p in range(n):
+            layer = {}
+            for state, poly in forward[p].items():
+                for value in (0, 1):
+                    nxt = step(p, state, value)
+                    if nxt is not None:
+                        _poly_add(layer.setdefault(nxt, {}), poly, value)
+            forward.append(layer)
+
+        backward = [None] * n + [{(): {0: 1}}]
+        for p in range(n - 1, -1, -1):
+            layer = {}
+            for state in forward[p]:
+                poly = {}
+                for value in (0, 1):
+                    nxt = step(p, state, value)
+                    if nxt is not None and nxt in backward[p + 1]:
+                        _poly_add(poly, backward[p + 1][nxt], value)
+                if poly:
+                    layer[state] = poly
+            backward[p] = layer
+
+        self.totals = forward[n].get((), {})
+        for p, cell in enumerate(cells):
+            mined = {}
+            for state, poly in forward[p].items():
+                nxt = step(p, state, 1)
+                if nxt is not None and nxt in backward[p + 1]:
+                    _poly_add(mined, _poly_mul(poly, backward[p + 1][nxt]), 1)
+            self.per_cell[cell] = mined
+
+
+class ProbabilityEngine:
+    def __init__(self, game, solver=None):
+        self.game = game
+        self.solver = solver or Solver(game)
+        self.cache = {}
+        self.hits = 0
+        self.misses = 0
+
+    def update(self, changed):
+        self.solver.update(changed)
+
+    def _components(self):
+        solver = self.solver
+        unknown, touching = solver.unknown, solver.touching
+        seen = set()
+        for start in touching:
+            if start in seen:
+                continue
+            cells = []
+            keys = set()
+            queue = deque([start])
+            seen.add(start)
+            # Breadth-first order keeps neighbouring cells close in the sweep
+            while queue:
+                cell = queue.popleft()
+                cells.append(cell)
+                for k in touching[cell]:
+                    if k in keys:
+                        continue
+                    keys.add(k)
+                    for other in unknown[k]:
+                        if other not in seen:
+                            seen.add(other)
+                            queue.append(other)
+            constraints = {(solver.need[k], frozenset(unknown[k])) for k in keys if unknown[k]}
+            yield frozenset(constraints), cells
+
+    def _component(self, key, cells):
+        component = self.cache.get(key)
+        if component is None:
+            self.misses += 1
+            component = Component(cells, sorted(key, key=lambda item: min(item[1])))
+        else:
+            self.hits += 1
+        return component
+
+    def probabilities(self):
+        # Returns ({cell: probability} for frontier and deduced cells,
+        #          probability shared by every other hidden cell)
+        game = self.game
+        solver = self.solver
+        solver.deduce()
+        cache = {}
+        components = []
+        for key, cells in self._components():
+            component = self._component(key, cells)
+            cache[key] = component
+            components.append(component)
+        # Keep only what the current board uses
+        self.cache = cache
+
+        hidden = game.mines + game.safe_left
+        frontier_cells = sum(len(component.cells) for component in components)
+        safe = sum(1 for i in solver.safe if not game.revealed_map[i])
+        interior = hidden - frontier_cells - len(solver.mines) - safe
+        mines_left = game.mines - len(solver.mines)
+
+        # Mine-count distribution of all components but one, for every one
+        prefix = [{0: 1}]
+        for component in components:
+            prefix.append(_poly_mul(prefix[-1], component.totals))
+        suffix = [{0: 1}]
+        for component in reversed(components):
+            suffix.append(_poly_mul(suffix[-1], component.totals))
+        suffix.reverse()
+        everything = prefix[-1]
+
+        def weight(frontier_mines):
+            return _interior_ways(interior, mines_left - frontier_mines)
+
+        total = sum(count * weight(m) for m, count in everything.items())
+        probabilities = {i: 1.0 for i in solver.mines}
+        for i in solver.safe:
+            if not game.revealed_map[i]:
+                probabilities[i] = 0.0
+        if total == 0:
+            # Inconsistent view (e.g. wrong mine count); nothing exact to say
+            return probabilities, None
+        for index, component in enumerate(components):
+            others = _poly_mul(prefix[index], suffix[index + 1])
+            for cell, mined in component.per_cell.items():
+                count = 0
+                for m, ways in mined.items():
+                    for o, other_ways in others.items():
+                        count += ways * other_ways * weight(m + o)
+                probabilities[cell] = count / total
+        interior_probability = None
+        if interior > 0:
+            expected = sum(count * weight(m) * (mines_left - m) for m, count in everything.items())
+            interior_probability = expected / (total * interior)
+        return probabilities, interior_probability
+
+    def best_move(self):
+        # Lowest-risk hidden cell as ("reveal", r, c, probability)
+        game = self.game
+        cols = game.cols
+        move = self.solver.next_move()
+        if move is None or move[3] == 0.0:
+            # Certain (or nothing left); exact probabilities only matter for guesses
+            return move
+        probabilities, interior = self.probabilities()
+        best, best_p = None, 2.0
+        for i, p in probabilities.items():
+            if p < best_p and not game.revealed_map[i] and not game.flagged_map[i]:
+                best, best_p = i, p
+        if interior is not None and interior < best_p:
+            i = self.solver.interior_cell()
+            if i is not None:
+                best, best_p = i, interior
+        if best is None:
+            return None
+        return "reveal", best // cols, best % cols, best_p
+
+
+def exact_policy(headless, rng):
+    # simulate.py policy: certain moves first, then the exact lowest-risk guess
+    engine = getattr(headless, "engine", None)
+    if engine is None or engine.game is not headless.game:
+        engine = headless.engine = ProbabilityEngine(headless.game)
+    else:
+        engine.update(headless.last_changed)
+    action, r, c, _ = engine.best_move()
+    return action, r, c
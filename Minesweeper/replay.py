@@ -0,0 +1,234 @@
+# replay.py
+# Move log and deterministic replay.
+#
+# A MoveLog is a stream of (kind, cell, milliseconds) records. RESET records
+# start a new board and point at a board entry (rows, cols, mines, seed,
+# topology, level); because mine placement only depends on the seed and the
+# first click, the seed plus the moves rebuild every position exactly.
+#
+# The Replayer keeps a snapshot every `interval` moves, so seeking to move N
+# replays at most interval - 1 moves from the nearest snapshot before N.
+
+import argparse
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_right
+
+from headless import HeadlessGame
+from savefile import write_atomic
+
+REVEAL = 0
+FLAG = 1
+CHORD = 2
+RESET = 3
+TIMEOUT = 4
+
+KIND_NAMES = {REVEAL: "reveal", FLAG: "flag", CHORD: "chord", RESET: "reset", TIMEOUT: "timeout"}
+
+MAGIC = b"MSLG"
+VERSION = 1
+HEADER = struct.Struct("<4sHII")
+BOARD = struct.Struct("<IIIQ16s32s")
+
+
+class MoveLog:
+    def __init__(self):
+        self.kinds = bytearray()
+        self.cells = array("I")
+        self.times = array("I")  # milliseconds since the log was started
+        self.boards = []         # (rows, cols, mines, seed, topology, level) per RESET
+        self._start = time.monotonic()
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def _append(self, kind, cell):
+        self.kinds.append(kind)
+        self.cells.append(cell)
+        self.times.append(int((time.monotonic() - self._start) * 1000))
+
+    def reset(self, game, level=""):
+        # The seed must fit the log for the board to be rebuilt from it
+        if not (isinstance(game.seed, int) and 0 <= game.seed < 2 ** 64):
+            raise ValueError("Only games with a 64-bit integer seed can be recorded")
+        self.boards.append((game.rows, game.cols, game.mines, game.seed, game.geometry.topology, level))
+        self._append(RESET, len(self.boards) - 1)
+
+    def record(self, kind, cell=0):
+        if not self.kinds:
+            raise ValueError("A move log has to start with a reset")
+        self._append(kind, cell)
+
+    def drop_game(self):
+        # Removes the last reset and every move after it
+        start = self.kinds.rfind(RESET)
+        if start < 0:
+            return
+        del self.boards[self.cells[start]:]
+        del self.kinds[start:], self.cells[start:], self.times[start:]
+
+    def __iter__(self):
+        return zip(self.kinds, self.cells, self.times)
+
+    def to_bytes(self):
+        cells, times = self.cells, self.times
+        if sys.byteorder == "big":
+            cells, times = array("I", cells), array("I", times)
+            cells.byteswap()
+            times.byteswap()
+        parts = [HEADER.pack(MAGIC, VERSION, len(self.boards), len(self.kinds))]
+        for rows, cols, mines, seed, topology, level in self.boards:
+            parts.append(BOARD.pack(rows, cols, mines, seed, topology.encode(), level.encode()[:32]))
+        parts += [bytes(self.kinds), cells.tobytes(), times.tobytes()]
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size:
+            raise ValueError("Not a Minesweeper move log: file too short")
+        magic, version, boards, moves = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a Minesweeper move log: bad magic")
+        if version != VERSION:
+            raise ValueError(f"Unsupported move log version {version}")
+        offset = HEADER.size
+        if len(data) != offset + boards * BOARD.size + 9 * moves:
+            raise ValueError("Truncated Minesweeper move log")
+        log = cls()
+        for _ in range(boards):
+            rows, cols, mines, seed, topology, level = BOARD.unpack_from(data, offset)
+            log.boards.append((rows, cols, mines, seed, topology.rstrip(b"\0").decode(),
+                               level.rstrip(b"\0").decode()))
+            offset += BOARD.size
+        log.kinds = bytearray(data[offset:offset + moves])
+        offset += moves
+        log.cells.frombytes(data[offset:offset + 4 * moves])
+        log.times.frombytes(data[offset + 4 * moves:offset + 8 * moves])
+        if sys.byteorder == "big":
+            log.cells.byteswap()
+            log.times.byteswap()
+        return log
+
+    def save(self, path):
+        write_atomic(path, (self.to_bytes(),))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class Replayer:
+    # Rebuilds the position after any number of moves of a log. The game it
+    # returns is the replayer's own and changes on the next seek.
+    def __init__(self, log, interval=256):
+        self.log = log
+        self.interval = interval
+        self.resets = [p for p, kind in enumerate(log.kinds) if kind == RESET]
+        self.snapshots = {}   # position -> (game copy, board index)
+        self.headless = None
+        self.board = None
+        self.position = 0
+
+    @property
+    def game(self):
+        return self.headless.game if self.headless is not None else None
+
+    def _apply(self, kind, cell):
+        headless = self.headless
+        if kind == RESET:
+            rows, cols, mines, seed, topology, level = self.log.boards[cell]
+            self.board = cell
+            # rows/cols/mines are explicit, so the level is only a label here
+            if headless is None:
+                self.headless = HeadlessGame(level, seed, rows, cols, mines, topology)
+            else:
+                headless.new_game(level, seed, rows, cols, mines, topology)
+            return
+        r, c = divmod(cell, headless.game.cols)
+        if kind == REVEAL:
+            headless.reveal(r, c)
+        elif kind == FLAG:
+            headless.flag(r, c)
+        elif kind == CHORD:
+            headless.chord(r, c)
+        elif kind == TIMEOUT:
+            headless.game.is_game_over = True
+            headless.game.is_win = False
+            headless.game.reveal_all()
+            headless.game.pop_changed()
+        else:
+            raise ValueError(f"Unknown move kind {kind}")
+
+    def _restore(self, position):
+        game, board = self.snapshots[position]
+        self.headless = HeadlessGame.from_game(game.copy(), self.log.boards[board][5])
+        self.board = board
+        self.position = position
+
+    def seek(self, n):
+        log = self.log
+        if not 0 <= n <= len(log):
+            raise IndexError(f"move {n} is outside the log (0..{len(log)})")
+        # Cheapest starting point: where we are, the last snapshot or the last reset
+        k = n // self.interval * self.interval
+        while k > 0 and k not in self.snapshots:
+            k -= self.interval
+        reset = self.resets[bisect_right(self.resets, n - 1) - 1] if n else 0
+        if self.position <= n and self.position >= max(k, reset):
+            start = self.position
+        elif k >= reset and k > 0:
+            self._restore(k)
+            start = k
+        else:
+            start = reset
+        if start == 0:
+            self.headless = None
+            self.board = None
+        kinds, cells = log.kinds, log.cells
+        interval = self.interval
+        for p in range(start, n):
+            self._apply(kinds[p], cells[p])
+            if (p + 1) % interval == 0 and p + 1 not in self.snapshots:
+                self.snapshots[p + 1] = (self.headless.game.copy(), self.board)
+        self.position = n
+        return self.game
+
+    def seek_time(self, ms):
+        # Position after every move made up to ms milliseconds into the log
+        return self.seek(bisect_right(self.log.times, ms))
+
+    def fast_forward(self):
+        return self.seek(len(self.log))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a Minesweeper move log")
+    parser.add_argument("log", help="move log written by the game (replay.mslog)")
+    parser.add_argument("--move", type=int, help="show the board after this many moves (default: the end)")
+    parser.add_argument("--list", action="store_true", help="print every move")
+    args = parser.parse_args()
+    log = MoveLog.load(args.log)
+    if args.list:
+        for p, (kind, cell, ms) in enumerate(log):
+            print(f"{p + 1:6d} {ms / 1000:9.3f}s {KIND_NAMES.get(kind, kind):8s} {cell}")
+    replayer = Replayer(log)
+    n = len(log) if args.move is None else args.move
+    start = time.perf_counter()
+    try:
+        replayer.seek(n)
+    except IndexError as e:
+        parser.error(str(e))
+    elapsed = time.perf_counter() - start
+    print(f"Move {n} of {len(log)} ({n / elapsed if elapsed else 0:.0f} moves/s)")
+    if replayer.headless is not None:
+        snapshot = replayer.headless.snapshot()
+        print(f"{snapshot['rows']}x{snapshot['cols']}, {snapshot['mines']} mines, seed {snapshot['seed']}: "
+              f"{snapshot['state']}")
+        print("\n".join(snapshot["board"]))
+
+
+if __name__ == "__main__":
+    main()
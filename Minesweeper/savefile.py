@@ -0,0 +1,256 @@
+# savefile.py
+# Versioned binary save format for MinesweeperGame.
+#
+#   header   struct HEADER (magic, version, flags, size, mine count, seed,
+#            elapsed seconds, score, topology, level name)
+#   planes   mine, revealed, flagged: one bit per cell, most significant
+#            bit first, each padded to a whole byte
+#
+# Adjacency counts are not stored; they follow from the mine plane.
+# open_save() maps the file and reads bits on demand, so a huge board opens
+# without unpacking anything; load_game() materializes a playable game.
+
+import mmap
+import os
+import struct
+
+from game import BoardView, MinesweeperGame
+from geometry import TOPOLOGIES, get_geometry
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the pure-Python path is used without it
+    np = None
+
+MAGIC = b"MSWP"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIIQdi16s32s")
+
+MINES_PLACED = 1
+GAME_OVER = 2
+WIN = 4
+HAS_SEED = 8
+
+_TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+_FROM_DIGITS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def pack_bits(plane):
+    # bytes of 0/1 -> bit-packed bytes
+    n = len(plane)
+    if np is not None:
+        return np.packbits(np.frombuffer(plane, dtype=np.uint8)).tobytes()
+    if n == 0:
+        return b""
+    padded = (n + 7) // 8 * 8
+    digits = bytes(plane).translate(_TO_DIGITS) + b"0" * (padded - n)
+    return int(digits, 2).to_bytes(padded // 8, "big")
+
+
+def unpack_bits(data, n):
+    # bit-packed bytes -> bytearray of 0/1, n cells long
+    if np is not None:
+        return bytearray(np.unpackbits(np.frombuffer(data, dtype=np.uint8), count=n).tobytes())
+    if n == 0:
+        return bytearray()
+    digits = format(int.from_bytes(data, "big"), f"0{len(data) * 8}b").encode()
+    return bytearray(digits[:n].translate(_FROM_DIGITS))
+
+
+def _plane_size(n):
+    return (n + 7) // 8
+
+
+def save_game(game, path, elapsed=0, score=0, level=""):
+    flags = 0
+    if game.mines_placed:
+        flags |= MINES_PLACED
+    if game.is_game_over:
+        flags |= GAME_OVER
+    if game.is_win:
+        flags |= WIN
+    seed = 0
+    if isinstance(game.seed, int) and 0 <= game.seed < 2 ** 64:
+        flags |= HAS_SEED
+        seed = game.seed
+    header = HEADER.pack(MAGIC, VERSION, flags, game.rows, game.cols, game.mines, seed, float(elapsed),
+                         int(score), game.geometry.topology.encode(), level.encode()[:32])
+    write_atomic(path, (header, pack_bits(game.mine_map), pack_bits(game.revealed_map),
+                        pack_bits(game.flagged_map)))
+
+
+def write_atomic(path, chunks):
+    # Write next to the target and swap it in, so a crash never leaves half a
+    # file; a failed write removes the temporary file instead of leaving it behind
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    os.replace(tmp_path, path)
+
+
+def _read_header(data):
+    if len(data) < HEADER.size:
+        raise ValueError("Not a Minesweeper save: file too short")
+    (magic, version, flags, rows, cols, mines, seed, elapsed, score,
+     topology, level) = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a Minesweeper save: bad magic")
+    if version != VERSION:
+        raise ValueError(f"Unsupported save version {version}")
+    n = rows * cols
+    if len(data) < HEADER.size + 3 * _plane_size(n):
+        raise ValueError("Truncated Minesweeper save")
+    topology = topology.rstrip(b"\0").decode(errors="replace")
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Unknown topology {topology!r} in Minesweeper save")
+    return {
+        "flags": flags,
+        "rows": rows,
+        "cols": cols,
+        "mines": mines,
+        "seed": seed if flags & HAS_SEED else None,
+        "elapsed": elapsed,
+        "score": score,
+        "topology": topology,
+        "level": level.rstrip(b"\0").decode(),
+    }
+
+
+class SavedGame:
+    # Header fields plus the materialized game
+    def __init__(self, game, elapsed, score, level):
+        self.game = game
+        self.elapsed = elapsed
+        self.score = score
+        self.level = level
+
+
+def load_game(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    meta = _read_header(data)
+    rows, cols = meta["rows"], meta["cols"]
+    n = rows * cols
+    game = MinesweeperGame(rows, cols, meta["mines"], seed=meta["seed"], topology=meta["topology"])
+    size = _plane_size(n)
+    offset = HEADER.size
+    game.mine_map[:] = unpack_bits(data[offset:offset + size], n)
+    game.revealed_map[:] = unpack_bits(data[offset + size:offset + 2 * size], n)
+    game.flagged_map[:] = unpack_bits(data[offset + 2 * size:offset + 3 * size], n)
+    _restore_state(game, meta["flags"], meta["seed"])
+    return SavedGame(game, meta["elapsed"], meta["score"], meta["level"])
+
+
+def _restore_state(game, flags, seed):
+    # A seed that did not fit the header is unknown, not the fresh one the constructor drew
+    game.seed = seed
+    game.mines_placed = bool(flags & MINES_PLACED)
+    game.is_game_over = bool(flags & GAME_OVER)
+    game.is_win = bool(flags & WIN)
+    game.flag_count = sum(game.flagged_map)
+    if game.mines_placed:
+        # Before the first click the mine plane is empty and safe_left keeps its default
+        game._calculate_adjacent_mines()
+        game.safe_left = game._count_safe_left()
+
+
+class BitPlane:
+    # Read-only 0/1 sequence backed by bit-packed bytes in the mapped file
+    def __init__(self, buffer, offset, n):
+        self.buffer = buffer
+        self.offset = offset
+        self.n = n
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.n:
+            raise IndexError("cell index out of range")
+        return (self.buffer[self.offset + (i >> 3)] >> (7 - (i & 7))) & 1
+
+    def unpack(self):
+        return unpack_bits(self.buffer[self.offset:self.offset + _plane_size(self.n)], self.n)
+
+
+class LazyAdjacency:
+    # Adjacency counts worked out per cell from the mine plane when asked for
+    def __init__(self, mapped):
+        self.mapped = mapped
+
+    def __len__(self):
+        return self.mapped.rows * self.mapped.cols
+
+    def __getitem__(self, i):
+        mapped = self.mapped
+        mine_map = mapped.mine_map
+        if mine_map[i]:
+            return 0
+        if mapped.topology != "square":
+            return sum(mine_map[j] for j in get_geometry(mapped.rows, mapped.cols, mapped.topology).neighbours(i))
+        rows, cols = mapped.rows, mapped.cols
+        r, c = divmod(i, cols)
+        return sum(mine_map[nr * cols + nc] for nr in range(max(r - 1, 0), min(r + 2, rows))
+                   for nc in range(max(c - 1, 0), min(c + 2, cols)) if nr != r or nc != c)
+
+
+class MappedGame:
+    # A save opened through mmap: board[r][c] reads single bits from the file,
+    # nothing is unpacked until to_game() is called
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            meta = _read_header(self._map)
+        except (ValueError, OSError):
+            self.close()
+            raise
+        self.rows, self.cols, self.mines = meta["rows"], meta["cols"], meta["mines"]
+        self.seed = meta["seed"]
+        self.elapsed = meta["elapsed"]
+        self.score = meta["score"]
+        self.level = meta["level"]
+        self.topology = meta["topology"]
+        self._flags = meta["flags"]
+        self.mines_placed = bool(self._flags & MINES_PLACED)
+        self.is_game_over = bool(self._flags & GAME_OVER)
+        self.is_win = bool(self._flags & WIN)
+        n = self.rows * self.cols
+        size = _plane_size(n)
+        self.mine_map = BitPlane(self._map, HEADER.size, n)
+        self.revealed_map = BitPlane(self._map, HEADER.size + size, n)
+        self.flagged_map = BitPlane(self._map, HEADER.size + 2 * size, n)
+        self.adjacent_map = LazyAdjacency(self)
+        self.board = BoardView(self)
+
+    def to_game(self):
+        game = MinesweeperGame(self.rows, self.cols, self.mines, seed=self.seed, topology=self.topology)
+        game.mine_map[:] = self.mine_map.unpack()
+        game.revealed_map[:] = self.revealed_map.unpack()
+        game.flagged_map[:] = self.flagged_map.unpack()
+        _restore_state(game, self._flags, self.seed)
+        return game
+
+    def close(self):
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_save(path):
+    return MappedGame(path)
@@ -0,0 +1,256 @@
+# server.py
+# asyncio game server: many concurrent sessions on seeded boards, one ASCII
+# line per message. A session is one board; every connection that joined it
+# sees every move as a delta of the cells it changed.
+#
+# client -> server
+#   NEW <level> [seed]      start a session and join it
+#   JOIN <session>          join a running session (shared board); BOARD fetches its cells
+#   R <r> <c>               reveal
+#   F <r> <c>               toggle a flag
+#   C <r> <c>               chord
+#   BOARD                   ask for the whole board
+#   QUIT
+# server -> client
+#   OK <session> <rows> <cols> <mines> <time limit, 0 for none> <seed>
+#   D <state> [<i>:<cell> ...]   reply to a move: the cells it changed (flat index r * cols + c)
+#   U <state> [<i>:<cell> ...]   pushed, not a reply: another member's move, or "U timeout"
+#   BOARD <state> <cells>        rows * cols cell characters
+#   ERR <reason>
+#
+# Every command gets exactly one reply line, in order; U lines can arrive in
+# between. Cells are '#' hidden, 'F' flag, '*' mine, '0'-'8' counts; states
+# are playing, won, lost and timeout. Time limits (Time Challenge, Expert) run
+# on the server from the moment a session is created, as the GUI timer does
+# from a reset; when one runs out every member gets "U timeout". A member
+# that stops reading is disconnected once MAX_PENDING bytes are queued for it.
+#
+#   python server.py --port 8765
+
+import argparse
+import asyncio
+import random
+import time
+
+import instrument
+from game import LEVELS
+from headless import HeadlessGame
+
+DEFAULT_PORT = 8765
+# A longer line closes the connection
+MAX_LINE = 256
+# Unsent bytes a member may have queued before it is disconnected
+MAX_PENDING = 1 << 20
+
+
+class Session:
+    def __init__(self, sid, level, seed, loop):
+        self.sid = sid
+        self.headless = HeadlessGame(level, seed=seed)
+        self.members = set()
+        # Makes a move and its broadcast one step for every member of the board
+        self.lock = asyncio.Lock()
+        self.timed_out = False
+        self.deadline = None
+        self._timer = None
+        limit = self.headless.time_limit
+        if limit:
+            self.deadline = loop.time() + limit
+            self._timer = loop.call_later(limit, self._expire)
+
+    @property
+    def state(self):
+        return "timeout" if self.timed_out else self.headless.state
+
+    def header(self):
+        game = self.headless.game
+        return f"OK {self.sid} {game.rows} {game.cols} {game.mines} {self.headless.time_limit or 0} {game.seed}\n"
+
+    def board(self):
+        game = self.headless.game
+        cells = "".join(self.headless.cell_state(i) for i in range(game.rows * game.cols))
+        return f"BOARD {self.state} {cells}\n"
+
+    def move(self, kind, r, c):
+        # Applies one move and returns the delta line
+        headless = self.headless
+        game = headless.game
+        if not (0 <= r < game.rows and 0 <= c < game.cols):
+            return None
+        if self.deadline is not None and asyncio.get_running_loop().time() >= self.deadline:
+            self._expire()
+        if game.is_game_over:
+            return f"D {self.state}\n"
+        if kind == "R":
+            changed = headless.reveal(r, c)
+        elif kind == "F":
+            changed = headless.flag(r, c)
+        else:
+            changed = headless.chord(r, c)
+        if game.is_game_over:
+            self.cancel()
+        cell_state = headless.cell_state
+        return f"D {self.state} {' '.join(f'{i}:{cell_state(i)}' for i in changed)}\n"
+
+    def _expire(self):
+        game = self.headless.game
+        if game.is_game_over:
+            return
+        game.is_game_over = True
+        game.is_win = False
+        self.timed_out = True
+        self.cancel()
+        self.broadcast(f"U {self.state}\n")
+
+    def broadcast(self, line, skip=None):
+        # Broadcasts are never drained; a member that stops reading is dropped
+        # once MAX_PENDING bytes are waiting for it, not buffered without end
+        data = line.encode()
+        for writer in self.members:
+            if writer is skip or writer.is_closing():
+                continue
+            if writer.transport.get_write_buffer_size() > MAX_PENDING:
+                # abort(), not close(): close() would wait to flush to a client that is not reading.
+                # The connection's handler sees the loss and leaves the session.
+                writer.transport.abort()
+                continue
+            writer.write(data)
+
+    def cancel(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+
+class GameServer:
+    def __init__(self, seed=None):
+        self.sessions = {}
+        self.connections = 0
+        self.moves = 0
+        self._next_sid = 1
+        self._seeds = random.Random(seed)
+
+    def new_session(self, level, seed):
+        sid = self._next_sid
+        self._next_sid += 1
+        if seed is None:
+            seed = self._seeds.getrandbits(63)
+        session = self.sessions[sid] = Session(sid, level, seed, asyncio.get_running_loop())
+        return session
+
+    def leave(self, session, writer):
+        # A session nobody is in any more is dropped
+        session.members.discard(writer)
+        if not session.members:
+            session.cancel()
+            self.sessions.pop(session.sid, None)
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        session = None
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(b"ERR line too long\n")
+                    break
+                reply = await self.command(line.decode("ascii", "replace").split(), session, writer)
+                if reply is None:
+                    break
+                if isinstance(reply, Session):
+                    if session is not None and session is not reply:
+                        self.leave(session, writer)
+                    session = reply
+                    session.members.add(writer)
+                    reply = session.header()
+                writer.write(reply.encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if session is not None:
+                self.leave(session, writer)
+            self.connections -= 1
+            writer.close()
+
+    async def command(self, words, session, writer):
+        # A reply line, a Session to join, or None to close the connection
+        if not words:
+            return "ERR empty command\n"
+        name = words[0].upper()
+        if name in ("R", "F", "C"):
+            if session is None:
+                return "ERR no session, send NEW or JOIN first\n"
+            try:
+                r, c = int(words[1]), int(words[2])
+            except (IndexError, ValueError):
+                return f"ERR usage: {name} <r> <c>\n"
+            stats = instrument.STATS
+            start = time.perf_counter()
+            async with session.lock:
+                delta = session.move(name, r, c)
+                if delta is None:
+                    return "ERR cell out of range\n"
+                self.moves += 1
+                session.broadcast("U" + delta[1:], skip=writer)
+            if stats is not None:
+                stats.record("server_move_ms", (time.perf_counter() - start) * 1000)
+            return delta
+        if name == "NEW":
+            # Level names may contain spaces ("Time Challenge"); a trailing number is the seed
+            seed = None
+            rest = words[1:]
+            if len(rest) > 1 and rest[-1].lstrip("-").isdigit():
+                seed = int(rest[-1])
+                rest = rest[:-1]
+            level = " ".join(rest) or "Easy"
+            if level not in LEVELS:
+                return f"ERR unknown level {level!r}\n"
+            return self.new_session(level, seed)
+        if name == "JOIN":
+            try:
+                return self.sessions[int(words[1])]
+            except (IndexError, ValueError, KeyError):
+                return "ERR no such session\n"
+        if name == "BOARD":
+            if session is None:
+                return "ERR no session\n"
+            return session.board()
+        if name == "QUIT":
+            return None
+        return f"ERR unknown command {name}\n"
+
+
+async def serve(host="127.0.0.1", port=DEFAULT_PORT, ready=None):
+    game_server = GameServer()
+    server = await asyncio.start_server(game_server.handle, host, port, limit=MAX_LINE, backlog=4096)
+    if ready is not None:
+        ready(server)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Minesweeper game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    def ready(server):
+        for sock in server.sockets:
+            host, port = sock.getsockname()[:2]
+            print(f"Serving on {host}:{port}", flush=True)
+    try:
+        asyncio.run(serve(args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if instrument.STATS is not None:
+            print(instrument.STATS.format())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+# simpool.py
+# Process-pool driver for mass simulation: each worker plays a contiguous seed
+# range and sends back one small record per game, never the boards themselves.
+#
+#   python simpool.py --games 100000 --configs Easy Expert 30x30x200
+#   python simpool.py --games 20000 --scaling
+
+import argparse
+import multiprocessing
+import os
+import random
+import time
+from array import array
+from collections import Counter
+
+from game import LEVELS
+from headless import HeadlessGame
+from simulate import load_policy
+
+# Per-game record: seed, won, moves, cells opened by the first click
+RECORD_FIELDS = 4
+
+
+def parse_config(spec):
+    # A level name or "ROWSxCOLSxMINES"
+    if spec in LEVELS:
+        rows, cols, mines, _ = LEVELS[spec]
+        return spec, rows, cols, mines
+    rows, cols, mines = (int(part) for part in spec.lower().split("x"))
+    return spec, rows, cols, mines
+
+
+def run_shard(task):
+    config, policy_name, seed_start, seed_stop = task
+    name, rows, cols, mines = config
+    policy = load_policy(policy_name)
+    records = array("q")
+    headless = HeadlessGame(rows=rows, cols=cols, mines=mines)
+    for seed in range(seed_start, seed_stop):
+        headless.new_game(name, seed, rows, cols, mines)
+        rng = random.Random(seed)
+        moves = 0
+        first_open = 0
+        while headless.state == "playing":
+            action, r, c = policy(headless, rng)
+            changed = getattr(headless, action)(r, c)
+            if moves == 0:
+                first_open = len(changed)
+            moves += 1
+        records.extend((seed, headless.state == "won", moves, first_open))
+    return name, records.tobytes()
+
+
+class Aggregate:
+    # Running totals, updated one shard at a time as results stream in
+    def __init__(self, rows, cols, mines):
+        self.cells = rows * cols
+        self.mines = mines
+        self.games = 0
+        self.wins = 0
+        self.moves = 0
+        # The first click is always on a zero, so every game floods; what varies
+        # is how far, kept as a histogram of flood sizes
+        self.first_open_sizes = Counter()
+        self.first_open_total = 0
+
+    def add(self, records):
+        for k in range(0, len(records), RECORD_FIELDS):
+            _, won, moves, first_open = records[k:k + RECORD_FIELDS]
+            self.games += 1
+            self.wins += won
+            self.moves += moves
+            self.first_open_sizes[first_open] += 1
+            self.first_open_total += first_open
+
+    def first_open_percentiles(self, *fractions):
+        # Flood sizes below which the given fractions of first clicks fall
+        result = []
+        sizes = sorted(self.first_open_sizes.items())
+        for fraction in fractions:
+            target = fraction * self.games
+            seen = 0
+            size = 0
+            for size, count in sizes:
+                seen += count
+                if seen >= target:
+                    break
+            result.append(size)
+        return result
+
+    def summary(self):
+        games = self.games or 1
+        return {
+            "games": self.games,
+            "density": self.mines / self.cells,
+            "win_rate": self.wins / games,
+            "avg_first_open": self.first_open_total / games,
+            "first_open_p10_p50_p90": self.first_open_percentiles(0.1, 0.5, 0.9),
+            "avg_moves": self.moves / games,
+        }
+
+
+def make_tasks(configs, policy_name, games, seed, shard_size):
+    tasks = []
+    for config in configs:
+        for start in range(seed, seed + games, shard_size):
+            tasks.append((config, policy_name, start, min(start + shard_size, seed + games)))
+    return tasks
+
+
+def run(configs, games, policy_name="random", workers=None, seed=0, shard_size=500, progress=None):
+    configs = [parse_config(spec) for spec in configs]
+    aggregates = {name: Aggregate(rows, cols, mines) for name, rows, cols, mines in configs}
+    tasks = make_tasks(configs, policy_name, games, seed, shard_size)
+    workers = workers or os.cpu_count() or 1
+    with multiprocessing.Pool(workers) as pool:
+        for done, (name, payload) in enumerate(pool.imap_unordered(run_shard, tasks), 1):
+            records = array("q")
+            records.frombytes(payload)
+            aggregates[name].add(records)
+            if progress:
+                progress(done, len(tasks))
+    return {name: aggregate.summary() for name, aggregate in aggregates.items()}
+
+
+def print_results(results, elapsed):
+    total = sum(r["games"] for r in results.values())
+    print(f"{'Config':<16}{'games':>9}{'density':>9}{'win %':>8}{'1st open':>10}{'p10/p50/p90':>16}{'moves':>8}")
+    for name, r in results.items():
+        spread = "/".join(str(size) for size in r["first_open_p10_p50_p90"])
+        print(f"{name:<16}{r['games']:>9}{r['density']:>9.3f}{100 * r['win_rate']:>8.2f}"
+              f"{r['avg_first_open']:>10.1f}{spread:>16}{r['avg_moves']:>8.1f}")
+    print(f"{total} games in {elapsed:.2f}s ({total / elapsed:.0f} games/s)")
+
+
+def bench_scaling(configs, games, policy_name, max_workers):
+    print(f"Scaling: {games} games per config")
+    baseline = None
+    workers = 1
+    while workers <= max_workers:
+        start = time.perf_counter()
+        run(configs, games, policy_name, workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"  {workers:>3} workers: {elapsed:7.2f}s  speedup {baseline / elapsed:5.2f}x")
+        workers *= 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multiprocess Minesweeper simulation")
+    parser.add_argument("--games", type=int, default=10000, help="games per config")
+    parser.add_argument("--configs", nargs="+", default=list(LEVELS), help="level names or ROWSxCOLSxMINES")
+    parser.add_argument("--policy", default="random")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--shard-size", type=int, default=500)
+    parser.add_argument("--scaling", action="store_true", help="time 1, 2, 4, ... up to --workers processes")
+    args = parser.parse_args()
+    if args.scaling:
+        bench_scaling(args.configs, args.games, args.policy, args.workers)
+        return
+    start = time.perf_counter()
+    results = run(args.configs, args.games, args.policy, args.workers, args.seed, args.shard_size)
+    print_results(results, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# simulate.py
+# Plays batches of headless games and reports throughput and move latency.
+#
+#   python simulate.py --games 1000 --levels Easy Hard --policy random
+
+import argparse
+import importlib
+import random
+import time
+
+from game import LEVELS
+from headless import HeadlessGame
+from probability import exact_policy
+from solver import solver_policy
+
+
+def random_policy(headless, rng):
+    # Reveal a random hidden, unflagged cell
+    game = headless.game
+    size = game.rows * game.cols
+    revealed_map, flagged_map = game.revealed_map, game.flagged_map
+    for _ in range(32):
+        i = rng.randrange(size)
+        if not revealed_map[i] and not flagged_map[i]:
+            break
+    else:
+        i = rng.choice([i for i in range(size) if not revealed_map[i] and not flagged_map[i]])
+    return "reveal", i // game.cols, i % game.cols
+
+
+POLICIES = {
+    "random": random_policy,
+    "solver": solver_policy,
+    "exact": exact_policy,
+}
+
+
+def load_policy(name):
+    # A registered name, or "module:function" for a custom policy
+    if name in POLICIES:
+        return POLICIES[name]
+    module_name, _, attr = name.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def play_game(policy, level, seed, latencies):
+    headless = HeadlessGame(level, seed=seed)
+    rng = random.Random(seed)
+    moves = 0
+    perf_counter = time.perf_counter
+    while headless.state == "playing":
+        action, r, c = policy(headless, rng)
+        move = getattr(headless, action)
+        start = perf_counter()
+        move(r, c)
+        latencies.append(perf_counter() - start)
+        moves += 1
+    return headless.state == "won", moves
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def run(games, levels, policy, seed=0):
+    results = {}
+    for level in levels:
+        latencies = []
+        wins = moves = 0
+        start = time.perf_counter()
+        for n in range(games):
+            won, played = play_game(policy, level, seed + n, latencies)
+            wins += won
+            moves += played
+        elapsed = time.perf_counter() - start
+        latencies.sort()
+        results[level] = {
+            "games": games,
+            "wins": wins,
+            "moves": moves,
+            "seconds": elapsed,
+            "games_per_sec": games / elapsed if elapsed else 0.0,
+            "p50_us": percentile(latencies, 50) * 1e6,
+            "p90_us": percentile(latencies, 90) * 1e6,
+            "p99_us": percentile(latencies, 99) * 1e6,
+            "max_us": (latencies[-1] if latencies else 0.0) * 1e6,
+        }
+    return results
+
+
+def print_results(results):
+    print(f"{'Level':<16}{'games':>7}{'win %':>8}{'games/s':>10}{'p50 us':>9}{'p90 us':>9}{'p99 us':>9}{'max us':>10}")
+    for level, r in results.items():
+        print(f"{level:<16}{r['games']:>7}{100 * r['wins'] / r['games']:>8.1f}{r['games_per_sec']:>10.1f}"
+              f"{r['p50_us']:>9.1f}{r['p90_us']:>9.1f}{r['p99_us']:>9.1f}{r['max_us']:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Minesweeper batch simulation")
+    parser.add_argument("--games", type=int, default=1000, help="games per level")
+    parser.add_argument("--levels", nargs="+", default=list(LEVELS), choices=list(LEVELS))
+    parser.add_argument("--policy", default="random", help=f"{', '.join(POLICIES)} or module:function")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game; game n uses seed + n")
+    args = parser.parse_args()
+    print_results(run(args.games, args.levels, load_policy(args.policy), args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# solver.py
+# Constraint-propagation solver working only from what the player can see.
+#
+# Every revealed number with hidden neighbours is a constraint: "need" mines
+# among its "unknown" neighbours. The frontier index maps each hidden cell to
+# the constraints that touch it, and update() only revisits constraints
+# touched by the cells that just changed, so the board is never rescanned.
+
+# Lowest probability reported for a cell that was not proven safe
+GUESS_FLOOR = 0.01
+
+
+class Solver:
+    def __init__(self, game):
+        self.game = game
+        self.unknown = {}   # constraint cell -> hidden neighbours not yet determined
+        self.need = {}      # constraint cell -> mines still missing among unknown
+        self.touching = {}  # frontier cell -> constraint cells it borders
+        self.mines = set()  # deduced mines
+        self.safe = set()   # deduced safe cells not yet revealed
+        self.dirty = set()  # constraints to re-check
+        # Unrevealed cells, kept up to date by update() so guesses never scan the board
+        revealed_map = game.revealed_map
+        self.hidden = {i for i in range(game.rows * game.cols) if not revealed_map[i]}
+        self.update(i for i in range(game.rows * game.cols) if revealed_map[i])
+
+    def update(self, changed):
+        # Feed the indices returned by a move (or game.pop_changed())
+        game = self.game
+        revealed_map, mine_map, adjacent_map = game.revealed_map, game.mine_map, game.adjacent_map
+        neighbours = game.geometry.neighbours
+        for i in changed:
+            if not revealed_map[i]:
+                continue
+            self.hidden.discard(i)
+            if mine_map[i]:
+                continue
+            self.safe.discard(i)
+            for k in self.touching.pop(i, ()):
+                self.unknown[k].discard(i)
+                self.dirty.add(k)
+            unknown = set()
+            need = adjacent_map[i]
+            for j in neighbours(i):
+                if j in self.mines:
+                    need -= 1
+                elif not revealed_map[j] and j not in self.safe:
+                    unknown.add(j)
+            if unknown:
+                self.unknown[i] = unknown
+                self.need[i] = need
+                for j in unknown:
+                    self.touching.setdefault(j, set()).add(i)
+                self.dirty.add(i)
+
+    def _mark_mine(self, j):
+        self.mines.add(j)
+        for k in self.touching.pop(j, ()):
+            self.unknown[k].discard(j)
+            self.need[k] -= 1
+            self.dirty.add(k)
+
+    def _mark_safe(self, j):
+        self.safe.add(j)
+        for k in self.touching.pop(j, ()):
+            self.unknown[k].discard(j)
+            self.dirty.add(k)
+
+    def _single_cell_pass(self):
+        found = False
+        while self.dirty:
+            k = self.dirty.pop()
+            unknown = self.unknown.get(k)
+            if unknown is None:
+                continue
+            if not unknown:
+                del self.unknown[k], self.need[k]
+                continue
+            need = self.need[k]
+            if need == 0:
+                for j in list(unknown):
+                    self._mark_safe(j)
+                found = True
+            elif need == len(unknown):
+                for j in list(unknown):
+                    self._mark_mine(j)
+                found = True
+        return found
+
+    def _subset_pass(self):
+        # If A's unknowns are a subset of B's, B \ A holds need[B] - need[A] mines
+        for a, unknown_a in list(self.unknown.items()):
+            if not unknown_a or a not in self.unknown:
+                continue
+            others = set()
+            for j in unknown_a:
+                others.update(self.touching.get(j, ()))
+            for b in others:
+                unknown_b = self.unknown.get(b)
+                if b == a or not unknown_b or len(unknown_b) <= len(unknown_a) or not unknown_a <= unknown_b:
+                    continue
+                rest = unknown_b - unknown_a
+                need = self.need[b] - self.need[a]
+                if need == 0:
+                    for j in rest:
+                        self._mark_safe(j)
+                    return True
+                if need == len(rest):
+                    for j in rest:
+                        self._mark_mine(j)
+                    return True
+        return False
+
+    def deduce(self):
+        # Run the rules until nothing new follows; returns True if anything was found
+        found = False
+        while True:
+            if self._single_cell_pass():
+                found = True
+                continue
+            if self._subset_pass():
+                found = True
+                continue
+            return found
+
+    def interior_cell(self):
+        # A hidden, unflagged cell that is neither on the frontier nor deduced, or None
+        flagged_map = self.game.flagged_map
+        touching, mines, safe = self.touching, self.mines, self.safe
+        for i in self.hidden:
+            if i not in touching and i not in mines and i not in safe and not flagged_map[i]:
+                return i
+        return None
+
+    def probabilities(self):
+        # Returns ({frontier cell: estimate}, estimate shared by every other
+        # undetermined cell or None if there are none). Each frontier cell takes
+        # the highest local density among its constraints; the interior shares
+        # the leftover mines.
+        frontier = {}
+        for k, unknown in self.unknown.items():
+            if unknown:
+                p = self.need[k] / len(unknown)
+                for j in unknown:
+                    frontier[j] = max(frontier.get(j, 0.0), p)
+        # Frontier, deduced mines and deduced safe cells are disjoint subsets of hidden
+        interior = len(self.hidden) - len(frontier) - len(self.mines) - len(self.safe)
+        if interior <= 0:
+            return frontier, None
+        mines_left = self.game.mines - len(self.mines) - sum(frontier.values())
+        # The frontier sum can overshoot; never report an estimate as certainly safe
+        return frontier, min(1.0, max(GUESS_FLOOR, mines_left / interior))
+
+    def _known_safe(self):
+        game = self.game
+        for i in self.safe:
+            if not game.revealed_map[i] and not game.flagged_map[i]:
+                return i
+        return None
+
+    def next_move(self):
+        # ("reveal", r, c, p) where p is the estimated mine probability, 0.0 when
+        # the cell is certainly safe. Does not change the game, so it doubles as a hint.
+        game = self.game
+        cols = game.cols
+        if not game.mines_placed:
+            return "reveal", game.rows // 2, cols // 2, 0.0
+        i = self._known_safe()
+        if i is None:
+            self.deduce()
+            i = self._known_safe()
+        if i is not None:
+            return "reveal", i // cols, i % cols, 0.0
+        frontier, interior = self.probabilities()
+        flagged_map = game.flagged_map
+        i = min((j for j in frontier if not flagged_map[j]), key=frontier.get, default=None)
+        # The frontier wins ties, as it did when interior cells were listed after it
+        if interior is not None and (i is None or interior < frontier[i]):
+            j = self.interior_cell()
+            if j is not None:
+                return "reveal", j // cols, j % cols, interior
+        if i is None:
+            return None
+        return "reveal", i // cols, i % cols, frontier[i]
+
+
+def solver_policy(headless, rng):
+    # simulate.py policy: keeps one Solver per game on the HeadlessGame
+    solver = getattr(headless, "solver", None)
+    if solver is None or solver.game is not headless.game:
+        solver = headless.solver = Solver(headless.game)
+    else:
+        solver.update(headless.last_changed)
+    action, r, c, _ = solver.next_move()
+    return action, r, c
@@ -0,0 +1,123 @@
+# sound.py
+# Non-blocking sound effects and background music.
+#
+# pygame is imported, the mixer opened and every asset loaded on a background
+# thread, so the window comes up without waiting for audio. play() only puts
+# a request on a queue; the same thread plays it. Requests that arrive before
+# the assets are loaded and go stale meanwhile are dropped, and a sound asked
+# for again within min_interval is coalesced into the one already playing.
+# Without pygame or an audio device everything is a silent no-op.
+
+import os
+import queue
+import threading
+import time
+
+SOUNDS = {
+    "click": "src/click.wav",
+    "explosion": "src/explosion.wav",
+    "win": "src/win.wav",
+}
+MUSIC = "src/background.mp3"
+MUSIC_VOLUME = 0.2
+
+# A sound this old by the time it could play is skipped instead of played late
+STALE_AFTER = 0.25
+
+# pygame.mixer is process-wide; managers must not open it concurrently
+_init_lock = threading.Lock()
+
+
+class SoundManager:
+    def __init__(self, base_dir, enabled=True, music=True, min_interval=0.05):
+        self.base_dir = base_dir
+        self.enabled = enabled
+        self.music = music
+        self.min_interval = min_interval
+        self.backend = "pending" if enabled else "silent"
+        self.ready = threading.Event()
+        self.played = 0
+        self.dropped = 0
+        self._sounds = {}
+        self._mixer = None
+        self._last = {}
+        self._queue = queue.Queue()
+        if enabled:
+            self._thread = threading.Thread(target=self._run, name="sound", daemon=True)
+            self._thread.start()
+        else:
+            self._thread = None
+            self.ready.set()
+
+    def _init_backend(self):
+        try:
+            # Imported here: importing pygame alone takes a noticeable part of startup
+            import pygame
+        except ImportError:
+            print("[WARNING] pygame is not installed. Sound disabled.")
+            return
+        try:
+            pygame.mixer.init()
+        except pygame.error as e:
+            print(f"[WARNING] No audio device ({e}). Sound disabled.")
+            return
+        self._mixer = pygame.mixer
+        for name, file_name in SOUNDS.items():
+            full_path = os.path.join(self.base_dir, file_name)
+            if not os.path.exists(full_path):
+                print(f"[WARNING] Sound file not found: {file_name}")
+                continue
+            try:
+                self._sounds[name] = pygame.mixer.Sound(full_path)
+            except pygame.error as e:
+                print(f"[WARNING] Could not load {file_name}: {e}")
+        if not self.music:
+            return
+        music_path = os.path.join(self.base_dir, MUSIC)
+        if not os.path.exists(music_path):
+            print("[WARNING] Background music not found. Skipping.")
+            return
+        try:
+            pygame.mixer.music.load(music_path)
+            pygame.mixer.music.set_volume(MUSIC_VOLUME)
+            pygame.mixer.music.play(-1)
+        except pygame.error as e:
+            print(f"[WARNING] Could not play background music: {e}")
+
+    def _run(self):
+        try:
+            with _init_lock:
+                self._init_backend()
+        finally:
+            self.backend = "pygame" if self._mixer is not None else "silent"
+            self.ready.set()
+        while True:
+            request = self._queue.get()
+            if request is None:
+                break
+            name, requested = request
+            sound = self._sounds.get(name)
+            if sound is None or time.monotonic() - requested > STALE_AFTER:
+                self.dropped += 1
+                continue
+            sound.play()
+            self.played += 1
+        if self._mixer is not None:
+            self._mixer.music.stop()
+
+    def play(self, name):
+        # Returns at once; the sound plays on the background thread
+        if not self.enabled or (self.ready.is_set() and self._mixer is None):
+            return
+        now = time.monotonic()
+        if now - self._last.get(name, -self.min_interval) < self.min_interval:
+            self.dropped += 1
+            return
+        self._last[name] = now
+        self._queue.put((name, now))
+
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=1)
+            self._thread = None
@@ -0,0 +1,94 @@
+# test_chunked.py
+
+import random
+
+import pytest
+
+import chunked
+from chunked import ChunkedGame
+
+
+def _is_mine(game, r, c):
+    # Straight from the layouts, never through a materialized chunk
+    if not game._in_bounds(r, c):
+        return 0
+    size = game.chunk
+    return game._layout(r // size, c // size)[(r % size) * size + c % size]
+
+
+def _brute_force_count(game, r, c):
+    return sum(_is_mine(game, r + dr, c + dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc)
+
+
+@pytest.fixture(params=["numpy", "python"])
+def count_path(request, monkeypatch):
+    if request.param == "numpy":
+        if chunked.np is None:
+            pytest.skip("NumPy not installed")
+    else:
+        monkeypatch.setattr(chunked, "np", None)
+    return request.param
+
+
+@pytest.mark.parametrize("rows, cols, chunk", [(None, None, 8), (20, 19, 8), (9, 9, 4), (70, 130, 64), (5, 3, 8)])
+def test_adjacency_across_chunk_borders(count_path, rows, cols, chunk):
+    game = ChunkedGame(seed=11, density=0.2, rows=rows, cols=cols, chunk=chunk)
+    # Chunks on every side of the origin, negative coordinates included when unbounded
+    span = range(-chunk - 2, 2 * chunk + 2) if rows is None else range(-1, max(rows, cols) + 1)
+    for r in span:
+        for c in span:
+            if not game._in_bounds(r, c):
+                continue
+            chunk_, i = game._chunk(r, c)
+            assert chunk_.mines[i] == _is_mine(game, r, c)
+            expected = 0 if chunk_.mines[i] else _brute_force_count(game, r, c)
+            assert chunk_.adjacent[i] == expected, (r, c)
+
+
+def test_layout_follows_the_seed_string():
+    game = ChunkedGame(seed=12345, density=0.17, chunk=16)
+    for cr, cc in [(0, 0), (-1, 3), (7, -2)]:
+        rng = random.Random(f"12345:{cr}:{cc}")
+        expected = bytearray(16 * 16)
+        for k in rng.sample(range(256), round(0.17 * 256)):
+            expected[k] = 1
+        assert game._layout(cr, cc) == expected
+
+
+def test_chunks_do_not_depend_on_generation_order():
+    keys = [(cr, cc) for cr in range(-2, 3) for cc in range(-2, 3)]
+    first = ChunkedGame(seed="abc", density=0.2, chunk=8)
+    second = ChunkedGame(seed="abc", density=0.2, chunk=8)
+    layouts = {key: bytes(first._layout(*key)) for key in keys}
+    for key in reversed(keys):
+        assert bytes(second._layout(*key)) == layouts[key]
+    assert bytes(ChunkedGame(seed="abd", density=0.2, chunk=8)._layout(0, 0)) != layouts[(0, 0)]
+
+
+@pytest.mark.parametrize("rows, cols, chunk", [(9, 9, 4), (20, 19, 8), (30, 70, 64)])
+@pytest.mark.parametrize("seed", range(5))
+def test_win_on_a_bounded_board(rows, cols, chunk, seed):
+    game = ChunkedGame(seed=seed, density=0.15, rows=rows, cols=cols, chunk=chunk)
+    game.reveal_cell(rows // 2, cols // 2)
+    mines = sum(_is_mine(game, r, c) for r in range(rows) for c in range(cols))
+    assert game.mines == mines
+    safe = [(r, c) for r in range(rows) for c in range(cols) if not _is_mine(game, r, c)]
+    random.Random(seed).shuffle(safe)
+
+    opened = set(game.pop_changed())
+    for r, c in safe:
+        opened.update(game.reveal_cell(r, c))
+        left = len(safe) - len(opened)
+        assert game.safe_left == left
+        # Won exactly when the last safe cell opens, never lost on a safe cell
+        assert game.is_game_over == game.is_win == (left == 0)
+    assert game.is_win and game.safe_left == 0
+    assert all(chunk.revealed[i] for chunk, i in (game._chunk(r, c) for r, c in safe))
+
+
+def test_mine_ends_a_bounded_game():
+    game = ChunkedGame(seed=3, density=0.2, rows=20, cols=20, chunk=8)
+    game.reveal_cell(10, 10)
+    r, c = next((r, c) for r in range(20) for c in range(20) if _is_mine(game, r, c))
+    assert game.reveal_cell(r, c) == [(r, c)]
+    assert game.is_game_over and not game.is_win
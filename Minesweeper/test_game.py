@@ -0,0 +1,96 @@
+# test_game.py
+
+import random
+
+import pytest
+
+import game as game_module
+from game import MinesweeperGame
+
+
+def _assert_counters(game):
+    # Before the first click there are no mines yet, so a full scan would count every cell
+    if game.mines_placed:
+        assert game.safe_left == game._count_safe_left()
+    assert game.flag_count == sum(game.flagged_map)
+
+
+def _play(game, rng, moves=400):
+    # Random reveals, flags and chords until the game ends, checking the counters after every move
+    size = game.rows * game.cols
+    for _ in range(moves):
+        if game.is_game_over:
+            break
+        i = rng.randrange(size)
+        r, c = divmod(i, game.cols)
+        roll = rng.random()
+        if roll < 0.2:
+            game.toggle_flag(r, c)
+        elif roll < 0.4 and game.mines_placed:
+            # Flag the hidden neighbours a number needs so the chord goes through sometimes
+            revealed = [j for j in range(size) if game.revealed_map[j] and game.adjacent_map[j]]
+            if revealed:
+                j = rng.choice(revealed)
+                for k in game.geometry.neighbours(j):
+                    if not game.revealed_map[k] and game.mine_map[k] and not game.flagged_map[k]:
+                        game.toggle_flag(*divmod(k, game.cols))
+                        _assert_counters(game)
+                game.chord(*divmod(j, game.cols))
+        else:
+            if game.mines_placed and rng.random() < 0.97:
+                # Mostly safe cells, so games last long enough to be won
+                hidden = [j for j in range(size) if not game.revealed_map[j] and not game.mine_map[j]
+                          and not game.flagged_map[j]]
+                if hidden:
+                    r, c = divmod(rng.choice(hidden), game.cols)
+            game.reveal_cell(r, c)
+        _assert_counters(game)
+    game.reveal_all()
+    _assert_counters(game)
+
+
+@pytest.mark.parametrize("topology", ["square", "torus", "hex"])
+@pytest.mark.parametrize("rows, cols, mines", [(9, 9, 10), (16, 16, 40), (24, 24, 99), (5, 30, 20)])
+def test_debug_counters_in_random_games(topology, rows, cols, mines):
+    for seed in range(10):
+        game = MinesweeperGame(rows, cols, mines, seed=seed, debug=True, topology=topology)
+        _play(game, random.Random(seed))
+
+
+def test_debug_detects_a_wrong_counter():
+    game = MinesweeperGame(9, 9, 10, seed=1, debug=True)
+    game.reveal_cell(4, 4)
+    game.safe_left += 1
+    with pytest.raises(AssertionError):
+        game._check_win()
+
+
+def _brute_force_counts(game):
+    rows, cols = game.rows, game.cols
+    counts = bytearray(rows * cols)
+    for r in range(rows):
+        for c in range(cols):
+            if game.mine_map[r * cols + c]:
+                continue
+            counts[r * cols + c] = sum(game.mine_map[nr * cols + nc]
+                                       for nr in range(max(0, r - 1), min(rows, r + 2))
+                                       for nc in range(max(0, c - 1), min(cols, c + 2)))
+    return counts
+
+
+ADJACENCY_METHODS = ["_calculate_adjacent_mines_python",
+                     pytest.param("_calculate_adjacent_mines_numpy",
+                                  marks=pytest.mark.skipif(game_module.np is None, reason="NumPy not installed"))]
+
+
+@pytest.mark.parametrize("method", ADJACENCY_METHODS)
+@pytest.mark.parametrize("rows, cols", [(1, 1), (1, 2), (1, 17), (17, 1), (2, 2), (3, 3), (9, 9), (31, 7)])
+@pytest.mark.parametrize("density", [0.0, 0.01, 0.2, 0.5, 0.99, 1.0])
+def test_adjacent_counts_match_brute_force(method, rows, cols, density):
+    rng = random.Random(rows * 1000 + cols)
+    game = MinesweeperGame(rows, cols, 0, seed=0)
+    # Written straight into the plane: 100% density is not a valid game but is a valid count
+    for i in range(rows * cols):
+        game.mine_map[i] = 1 if rng.random() < density else 0
+    getattr(game, method)()
+    assert game.adjacent_map == _brute_force_counts(game)
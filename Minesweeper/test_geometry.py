@@ -0,0 +1,36 @@
+# test_geometry.py
+
+import pytest
+
+from geometry import TOPOLOGIES, Geometry, _cached_geometry, get_geometry
+
+
+class FlatHexGeometry(Geometry):
+    # Flat-top hexagons with odd columns shifted half a cell down: the pattern
+    # depends on the column, which only column_key() can express
+    topology = "flat-hex-test"
+
+    def column_key(self, c):
+        return super().column_key(c), c % 2
+
+    def cell_neighbours(self, r, c):
+        shift = c % 2
+        deltas = ((-1, 0), (1, 0), (shift - 1, -1), (shift, -1), (shift - 1, 1), (shift, 1))
+        return [(r + dr, c + dc) for dr, dc in deltas if 0 <= r + dr < self.rows and 0 <= c + dc < self.cols]
+
+
+@pytest.mark.parametrize("topology", sorted(TOPOLOGIES))
+@pytest.mark.parametrize("rows, cols", [(1, 1), (1, 7), (7, 1), (2, 2), (3, 3), (6, 6), (5, 8)])
+def test_tables_match_cell_neighbours(topology, rows, cols):
+    assert TOPOLOGIES[topology](rows, cols).check() == []
+
+
+@pytest.mark.parametrize("rows, cols", [(1, 6), (6, 1), (6, 6), (7, 9)])
+def test_column_dependent_topology(rows, cols):
+    assert FlatHexGeometry(rows, cols).check() == []
+
+
+def test_default_topology_shares_cache_entry():
+    _cached_geometry.cache_clear()
+    assert get_geometry(13, 17) is get_geometry(13, 17, "square")
+    assert _cached_geometry.cache_info().currsize == 1
@@ -0,0 +1,95 @@
+# test_leaderboard.py
+
+import random
+import sqlite3
+import threading
+
+import instrument
+from leaderboard import LeaderboardCache, LeaderboardStore
+
+
+def _names(entries):
+    return [entry["name"] for entry in entries]
+
+
+def _flush(cache, timeout=5):
+    # flush() blocks forever if the writer thread died; fail instead of hanging
+    done = threading.Thread(target=cache.flush, daemon=True)
+    done.start()
+    done.join(timeout)
+    assert not done.is_alive(), "flush() did not return"
+
+
+def test_failed_write_is_not_kept_in_the_cache(tmp_path):
+    cache = LeaderboardCache(LeaderboardStore(str(tmp_path / "leaderboard.db")))
+    cache.add("saved", 10, "Easy", 5)
+    cache.flush()
+
+    def fail(*args):
+        raise sqlite3.OperationalError("disk I/O error")
+    add = cache.store.add
+    cache.store.add = fail
+    cache.add("lost", 999, "Easy", 1)
+    cache.flush()
+    assert [entry["name"] for entry in cache.top()] == ["saved"]
+
+    cache.store.add = add
+    cache.add("later", 20, "Easy", 5)
+    cache.flush()
+    assert [entry["name"] for entry in cache.top("Easy")] == ["later", "saved"]
+
+
+def test_writer_survives_any_error(tmp_path, monkeypatch):
+    cache = LeaderboardCache(LeaderboardStore(str(tmp_path / "leaderboard.db")))
+
+    class BrokenStats:
+        def record(self, *args):
+            raise KeyError("leaderboard_save_ms")
+    monkeypatch.setattr(instrument, "STATS", BrokenStats())
+    cache.add("first", 10, "Easy", 5)
+    _flush(cache)
+    assert cache._writer.is_alive()
+
+    monkeypatch.setattr(instrument, "STATS", None)
+    cache.add("second", 20, "Easy", 5)
+    _flush(cache)
+    assert _names(cache.store.top(level="Easy")) == ["second", "first"]
+    assert _names(cache.top("Easy")) == ["second", "first"]
+
+
+def test_top_k_per_level_matches_the_store(tmp_path):
+    cache = LeaderboardCache(LeaderboardStore(str(tmp_path / "leaderboard.db")), k=5)
+    rng = random.Random(1)
+    levels = ["Easy", "Medium", "Expert"]
+    added = []
+
+    def expected(level=None):
+        # Highest score, then fastest, then oldest first
+        entries = [entry for entry in added if level is None or entry["level"] == level]
+        return sorted(entries, key=lambda entry: (-entry["score"], entry["duration"]))[:5]
+    for n in range(200):
+        entry = {"name": f"p{n}", "score": rng.randrange(50), "level": rng.choice(levels),
+                 "duration": rng.randrange(1, 30)}
+        added.append(entry)
+        cache.add(**entry)
+        if n % 20 == 0:
+            assert cache.top(entry["level"]) == expected(entry["level"])
+            assert cache.top() == expected()
+    _flush(cache)
+    for level in levels:
+        assert cache.top(level) == cache.store.top(5, level)
+    assert cache.top() == cache.store.top(5)
+    assert cache.top("Nobody plays this") == []
+
+
+def test_external_write_is_picked_up(tmp_path):
+    path = str(tmp_path / "leaderboard.db")
+    cache = LeaderboardCache(LeaderboardStore(path))
+    cache.add("mine", 10, "Easy", 5)
+    _flush(cache)
+    assert _names(cache.top()) == ["mine"]
+
+    # Another process writing the same file changes its mtime/size
+    LeaderboardStore(path).add("theirs", 30, "Expert", 9)
+    assert _names(cache.top()) == ["theirs", "mine"]
+    assert _names(cache.top("Expert")) == ["theirs"]
@@ -0,0 +1,49 @@
+# test_noguess.py
+
+import time
+
+from noguess import BoardPool
+from savefile import pack_bits
+
+
+def _layout(i):
+    layout = bytearray(81)
+    layout[80 - i] = 1
+    return layout
+
+
+def test_close_keeps_memory_boards(tmp_path):
+    path = str(tmp_path / "noguess.db")
+    pool = BoardPool([(9, 9, 10)], path, memory_per_class=2, disk_per_class=1)
+    key = next(iter(pool.memory))
+    pool.memory[key].append(pack_bits(_layout(0)))
+    pool.close()
+    assert pool.ready() == 1
+
+    reopened = BoardPool([(9, 9, 10)], path, memory_per_class=2, disk_per_class=1)
+    assert reopened.ready() == 1
+    assert reopened.take(9, 9, 10, key[3], key[4]) == _layout(0)
+    assert reopened.ready() == 0
+
+
+def test_close_stays_within_disk_per_class(tmp_path):
+    path = str(tmp_path / "noguess.db")
+    for _ in range(3):
+        pool = BoardPool([(9, 9, 10)], path, memory_per_class=2, disk_per_class=3)
+        key = next(iter(pool.memory))
+        pool.memory[key].extend(pack_bits(_layout(i)) for i in range(2))
+        pool.close()
+    reopened = BoardPool([(9, 9, 10)], path, memory_per_class=2, disk_per_class=3)
+    assert reopened.on_disk[key] == 3
+    assert reopened.ready() == 3
+
+
+def test_close_cancels_generation_in_flight(tmp_path):
+    # Expert boards take long enough that close() would otherwise wait on them
+    pool = BoardPool([(16, 30, 99)], str(tmp_path / "noguess.db"), memory_per_class=1,
+                     disk_per_class=0, workers=1).start()
+    time.sleep(2)
+    start = time.perf_counter()
+    pool.close()
+    assert time.perf_counter() - start < 2
+    assert pool._thread is None
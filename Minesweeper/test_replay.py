@@ -0,0 +1,46 @@
+# test_replay.py
+
+import pytest
+
+from game import MinesweeperGame
+from replay import FLAG, RESET, REVEAL, MoveLog
+
+
+def test_drop_game_removes_the_last_game_only():
+    log = MoveLog()
+    first = MinesweeperGame(9, 9, 10, seed=1)
+    log.reset(first, "Easy")
+    log.record(REVEAL, 40)
+    log.record(FLAG, 3)
+    log.reset(MinesweeperGame(16, 16, 40, seed=2), "Medium")
+    log.record(FLAG, 7)
+    log.drop_game()
+    assert list(log.kinds) == [RESET, REVEAL, FLAG]
+    assert list(log.cells) == [0, 40, 3]
+    assert log.boards == [(9, 9, 10, 1, "square", "Easy")]
+    assert MoveLog.from_bytes(log.to_bytes()).boards == log.boards
+    log.drop_game()
+    assert not log and log.boards == []
+    log.drop_game()
+    assert not log
+
+
+def test_save_replaces_the_old_log(tmp_path, monkeypatch):
+    path = str(tmp_path / "last.mslog")
+    log = MoveLog()
+    log.reset(MinesweeperGame(9, 9, 10, seed=1), "Easy")
+    log.record(REVEAL, 40)
+    log.save(path)
+    assert MoveLog.load(path).to_bytes() == log.to_bytes()
+    assert list(tmp_path.iterdir()) == [tmp_path / "last.mslog"]
+
+    # A write that fails part way leaves the previous log in place
+    def fail():
+        raise OSError("disk full")
+    monkeypatch.setattr(log, "to_bytes", fail)
+    log.record(FLAG, 3)
+    with pytest.raises(OSError):
+        log.save(path)
+    loaded = MoveLog.load(path)
+    assert list(loaded.kinds) == [RESET, REVEAL]
+    assert list(tmp_path.iterdir()) == [tmp_path / "last.mslog"]
@@ -0,0 +1,173 @@
+# test_savefile.py
+
+import random
+
+import pytest
+
+import savefile
+from game import MinesweeperGame
+from savefile import HEADER, load_game, open_save, pack_bits, save_game, unpack_bits
+
+
+@pytest.fixture(params=["numpy", "python"])
+def bit_path(request, monkeypatch):
+    # Runs a test once with NumPy's packbits and once with the pure-Python fallback
+    if request.param == "numpy":
+        if savefile.np is None:
+            pytest.skip("NumPy not installed")
+    else:
+        monkeypatch.setattr(savefile, "np", None)
+    return request.param
+
+
+def _played(rows, cols, mines, topology="square", seed=3, moves=20):
+    game = MinesweeperGame(rows, cols, mines, seed=seed, topology=topology)
+    rng = random.Random(seed)
+    game.reveal_cell(rows // 2, cols // 2)
+    for _ in range(moves):
+        if game.is_game_over:
+            break
+        r, c = rng.randrange(rows), rng.randrange(cols)
+        if rng.random() < 0.3:
+            game.toggle_flag(r, c)
+        elif not game.mine_map[r * cols + c]:
+            game.reveal_cell(r, c)
+    return game
+
+
+def _assert_same(loaded, game):
+    for attr in ("rows", "cols", "mines", "seed", "mines_placed", "is_game_over", "is_win",
+                 "safe_left", "flag_count", "mine_map", "revealed_map", "flagged_map", "adjacent_map"):
+        assert getattr(loaded, attr) == getattr(game, attr), attr
+    assert loaded.geometry.topology == game.geometry.topology
+
+
+@pytest.mark.parametrize("n", [0, 1, 7, 8, 9, 15, 16, 17, 1000])
+def test_pack_bits_round_trip(bit_path, n):
+    plane = bytearray(random.Random(n).getrandbits(1) for _ in range(n))
+    packed = pack_bits(plane)
+    assert len(packed) == (n + 7) // 8
+    assert unpack_bits(packed, n) == plane
+
+
+@pytest.mark.skipif(savefile.np is None, reason="NumPy not installed")
+def test_pack_bits_paths_agree(monkeypatch):
+    plane = bytearray(random.Random(1).getrandbits(1) for _ in range(1001))
+    packed = pack_bits(plane)
+    monkeypatch.setattr(savefile, "np", None)
+    assert pack_bits(plane) == packed
+
+
+@pytest.mark.parametrize("topology", ["square", "torus", "hex"])
+@pytest.mark.parametrize("rows, cols, mines", [(9, 9, 10), (7, 13, 15), (1, 5, 1), (24, 24, 99)])
+def test_save_load_round_trip(bit_path, tmp_path, topology, rows, cols, mines):
+    game = _played(rows, cols, mines, topology)
+    path = str(tmp_path / "game.msw")
+    save_game(game, path, elapsed=12.5, score=34, level="Custom")
+    saved = load_game(path)
+    _assert_same(saved.game, game)
+    assert (saved.elapsed, saved.score, saved.level) == (12.5, 34, "Custom")
+
+
+def test_save_before_first_click(bit_path, tmp_path):
+    game = MinesweeperGame(9, 9, 10, seed=5)
+    game.toggle_flag(0, 0)
+    path = str(tmp_path / "game.msw")
+    save_game(game, path)
+    loaded = load_game(path).game
+    _assert_same(loaded, game)
+    # The first click after loading still gets a safe opening
+    loaded.reveal_cell(4, 4)
+    assert not loaded.is_game_over or loaded.is_win
+
+
+@pytest.mark.parametrize("topology", ["square", "torus", "hex"])
+def test_open_save_reads_like_the_live_game(tmp_path, topology):
+    game = _played(11, 13, 20, topology)
+    path = str(tmp_path / "game.msw")
+    save_game(game, path, score=7, level="Easy")
+    with open_save(path) as mapped:
+        assert (mapped.rows, mapped.cols, mapped.mines, mapped.score, mapped.level) == (11, 13, 20, 7, "Easy")
+        for r in range(game.rows):
+            for c in range(game.cols):
+                live, disk = game.board[r][c], mapped.board[r][c]
+                assert (disk.is_mine, disk.revealed, disk.flagged, disk.adjacent_mines) == \
+                    (live.is_mine, live.revealed, live.flagged, live.adjacent_mines)
+        _assert_same(mapped.to_game(), game)
+
+
+def _saved_bytes(tmp_path):
+    path = str(tmp_path / "game.msw")
+    save_game(_played(9, 9, 10), path)
+    with open(path, "rb") as f:
+        return path, bytearray(f.read())
+
+
+def _write(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def test_bad_magic(tmp_path):
+    path, data = _saved_bytes(tmp_path)
+    data[:4] = b"NOPE"
+    _write(path, data)
+    with pytest.raises(ValueError, match="bad magic"):
+        load_game(path)
+    with pytest.raises(ValueError, match="bad magic"):
+        open_save(path)
+
+
+def test_wrong_version(tmp_path):
+    path, data = _saved_bytes(tmp_path)
+    data[4:6] = (savefile.VERSION + 1).to_bytes(2, "little")
+    _write(path, data)
+    with pytest.raises(ValueError, match="version"):
+        load_game(path)
+
+
+@pytest.mark.parametrize("keep", [0, 10, HEADER.size, -1])
+def test_truncated(tmp_path, keep):
+    path, data = _saved_bytes(tmp_path)
+    _write(path, data[:keep] if keep >= 0 else data[:-1])
+    with pytest.raises(ValueError):
+        load_game(path)
+
+
+def test_unknown_topology(tmp_path):
+    path, data = _saved_bytes(tmp_path)
+    start = data.index(b"square")
+    data[start:start + 6] = b"zzzzzz"
+    _write(path, data)
+    with pytest.raises(ValueError, match="Unknown topology 'zzzzzz'"):
+        load_game(path)
+    with pytest.raises(ValueError, match="Unknown topology"):
+        open_save(path)
+
+
+def test_failed_save_keeps_the_old_file(tmp_path, monkeypatch):
+    path, data = _saved_bytes(tmp_path)
+
+    def fail(plane):
+        raise OSError("disk full")
+    monkeypatch.setattr(savefile, "pack_bits", fail)
+    with pytest.raises(OSError):
+        save_game(_played(9, 9, 10, seed=4), path)
+    with open(path, "rb") as f:
+        assert f.read() == data
+    assert list(tmp_path.iterdir()) == [tmp_path / "game.msw"]
+
+
+def test_write_atomic_removes_the_temporary_file(tmp_path):
+    path = str(tmp_path / "out.bin")
+
+    def chunks():
+        yield b"partial"
+        raise OSError("disk full")
+    with pytest.raises(OSError):
+        savefile.write_atomic(path, chunks())
+    assert list(tmp_path.iterdir()) == []
+    savefile.write_atomic(path, [b"a", b"b"])
+    with open(path, "rb") as f:
+        assert f.read() == b"ab"
+    assert list(tmp_path.iterdir()) == [tmp_path / "out.bin"]
@@ -0,0 +1,50 @@
+# test_server.py
+
+import asyncio
+
+import server
+from server import Session
+
+
+class StubTransport:
+    def __init__(self, pending):
+        self.pending = pending
+        self.aborted = False
+
+    def get_write_buffer_size(self):
+        return self.pending
+
+    def abort(self):
+        self.aborted = True
+
+
+class StubWriter:
+    def __init__(self, pending=0):
+        self.transport = StubTransport(pending)
+        self.data = []
+
+    def is_closing(self):
+        return self.transport.aborted
+
+    def write(self, data):
+        self.data.append(data)
+        self.transport.pending += len(data)
+
+
+def test_broadcast_drops_members_that_stop_reading(monkeypatch):
+    monkeypatch.setattr(server, "MAX_PENDING", 100)
+    loop = asyncio.new_event_loop()
+    try:
+        session = Session(1, "Easy", 7, loop)
+        mover, reader, stalled = StubWriter(), StubWriter(), StubWriter(pending=90)
+        session.members.update((mover, reader, stalled))
+        line = "U playing 0:1\n"
+        for _ in range(5):
+            reader.transport.pending = 0  # this one keeps up
+            session.broadcast(line, skip=mover)
+    finally:
+        loop.close()
+    assert mover.data == []
+    assert reader.data == [line.encode()] * 5
+    # Written while under the cap, then cut off instead of buffering more
+    assert len(stalled.data) == 1 and stalled.transport.aborted
@@ -0,0 +1,26 @@
+# test_simpool.py
+
+from array import array
+
+from simpool import Aggregate, run_shard
+
+
+def test_first_open_percentiles():
+    aggregate = Aggregate(9, 9, 10)
+    records = array("q")
+    for seed, size in enumerate([1, 2, 3, 4, 5, 6, 7, 8, 9, 10]):
+        records.extend((seed, 1, 3, size))
+    aggregate.add(records)
+    assert aggregate.first_open_percentiles(0.1, 0.5, 0.9, 1.0) == [1, 5, 9, 10]
+    assert aggregate.summary()["avg_first_open"] == 5.5
+
+
+def test_shard_first_open_sizes_vary():
+    name, payload = run_shard((("Easy", 9, 9, 10), "solver", 0, 50))
+    records = array("q")
+    records.frombytes(payload)
+    aggregate = Aggregate(9, 9, 10)
+    aggregate.add(records)
+    assert aggregate.games == 50
+    assert len(aggregate.first_open_sizes) > 1
+    assert min(aggregate.first_open_sizes) >= 1
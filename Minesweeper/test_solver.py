@@ -0,0 +1,47 @@
+# test_solver.py
+
+import random
+
+import pytest
+
+from game import MinesweeperGame
+from probability import ProbabilityEngine
+from solver import Solver
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_hidden_set_and_interior_cell(seed):
+    game = MinesweeperGame(16, 30, 99, seed=seed)
+    solver = Solver(game)
+    rng = random.Random(seed)
+    while not game.is_game_over:
+        move = solver.next_move()
+        if move is None:
+            break
+        _, r, c, p = move
+        if rng.random() < 0.1:
+            game.toggle_flag(rng.randrange(game.rows), rng.randrange(game.cols))
+        game.reveal_cell(r, c)
+        solver.update(game.pop_changed())
+        solver.deduce()
+        assert solver.hidden == {i for i in range(game.rows * game.cols) if not game.revealed_map[i]}
+        frontier, interior = solver.probabilities()
+        cells = [i for i in solver.hidden if i not in frontier and i not in solver.mines and i not in solver.safe]
+        assert (interior is None) == (not cells)
+        i = solver.interior_cell()
+        assert i == next((j for j in solver.hidden if j in cells and not game.flagged_map[j]), None)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_exact_guess_is_hidden_and_unflagged(seed):
+    game = MinesweeperGame(16, 16, 40, seed=seed)
+    engine = ProbabilityEngine(game)
+    while not game.is_game_over:
+        move = engine.best_move()
+        if move is None:
+            break
+        _, r, c, _ = move
+        i = r * game.cols + c
+        assert not game.revealed_map[i] and not game.flagged_map[i]
+        game.reveal_cell(r, c)
+        engine.update(game.pop_changed())
@@ -0,0 +1,33 @@
+# tkstub.py
+# Stand-in Tk widgets for timing the renderers and MinesweeperApp without a
+# window. Swap FAKE_TK in for main.tk and hand FakeWidget to the renderers.
+
+import types
+
+
+class FakeWidget:
+    # Accepts every Tk call and counts it; canvas items get increasing ids
+    calls = 0
+
+    def __init__(self, *args, **kwargs):
+        FakeWidget.calls += 1
+        self._items = 0
+
+    def winfo_children(self):
+        return []
+
+    def _create(self, *args, **kwargs):
+        FakeWidget.calls += 1
+        self._items += 1
+        return self._items
+
+    create_rectangle = create_text = _create
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            FakeWidget.calls += 1
+        return call
+
+
+FAKE_TK = types.SimpleNamespace(Button=FakeWidget, Canvas=FakeWidget, RAISED="raised",
+                                SUNKEN="sunken", DISABLED="disabled", NORMAL="normal")
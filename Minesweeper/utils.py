@@ -1,70 +1,54 @@
-import json
-import os
+import sqlite3
 
-def dfs_reveal(board, x, y, rows, cols):
-    stack = [(x, y)]
-    visited = set()
-    while stack:
-        cx, cy = stack.pop()
-        if (cx, cy) in visited:
-            continue
-        visited.add((cx, cy))
+from flood import flood_fill
+from geometry import get_geometry
+from leaderboard import DEFAULT_PATH, get_store
+
+class _CellPlane:
+    # Presents one attribute of a grid of cell.Cell objects as a flat sequence
+    # so the shared flood fill can walk it; writing reveals the cell
+    def __init__(self, board, cols, attr):
+        self.board = board
+        self.cols = cols
+        self.attr = attr
 
-        cell = board[cx][cy]
-        if cell.flagged or cell.revealed:
-            continue
+    def __getitem__(self, i):
+        return getattr(self.board[i // self.cols][i % self.cols], self.attr)
 
-        cell.reveal()
+    def __setitem__(self, i, value):
+        self.board[i // self.cols][i % self.cols].reveal()
 
-        if cell.adjacent_mines == 0 and not cell.is_mine:
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    nx, ny = cx + dx, cy + dy
-                    if 0 <= nx < rows and 0 <= ny < cols and (nx, ny) not in visited:
-                        stack.append((nx, ny))
+def dfs_reveal(board, x, y, rows, cols):
+    # Returns the (x, y) positions revealed
+    geometry = get_geometry(rows, cols)
+    opened = flood_fill(x * cols + y, _CellPlane(board, cols, "revealed"), _CellPlane(board, cols, "flagged"),
+                        _CellPlane(board, cols, "is_mine"), _CellPlane(board, cols, "adjacent_mines"),
+                        geometry.kinds, geometry.offsets)
+    return [divmod(i, cols) for i in opened]
 
 def format_time(seconds):
     mins = seconds // 60
     secs = seconds % 60
     return f"{mins:02d}:{secs:02d}"
 
-def load_leaderboard(file_path="leaderboard.json"):
-    if not os.path.exists(file_path):
-        # Jika file tidak ada, buat file kosong
-        with open(file_path, "w") as f:
-            json.dump([], f)
-        return []
+def load_leaderboard(file_path=DEFAULT_PATH, level=None, limit=10):
+    # Top scores, optionally for one level, from the SQLite store
     try:
-        with open(file_path, "r") as f:
-            data = json.load(f)
-            # Validasi: pastikan data list of dict
-            if isinstance(data, list):
-                return data
-            else:
-                return []
-    except Exception as e:
+        return get_store(file_path).top(limit, level)
+    except sqlite3.Error as e:
         print(f"[ERROR] Failed to load leaderboard: {e}")
-        # Jika file corrupt, reset leaderboard
-        with open(file_path, "w") as f:
-            json.dump([], f)
         return []
 
-def save_leaderboard(scores, file_path="leaderboard.json"):
+def save_leaderboard(scores, file_path=DEFAULT_PATH):
+    # Replaces the whole history with the given entries in one transaction
     try:
-        with open(file_path, "w") as f:
-            json.dump(scores, f, indent=4)
-    except Exception as e:
+        get_store(file_path).replace_all(scores)
+    except sqlite3.Error as e:
         print(f"[ERROR] Failed to save leaderboard: {e}")
 
-def add_score(name, score, level, duration, file_path="leaderboard.json"):
-    scores = load_leaderboard(file_path)
-    scores.append({
-        "name": name,
-        "score": score,
-        "level": level,
-        "duration": duration  # dalam detik
-    })
-    # Sort descending by score, jika sama urutkan berdasarkan waktu tercepat
-    scores.sort(key=lambda x: (-x["score"], x["duration"]))
-    scores = scores[:10]  # Keep top 10 scores
-    save_leaderboard(scores, file_path)
\ No newline at end of file
+def add_score(name, score, level, duration, file_path=DEFAULT_PATH):
+    # Appends one game; the full history is kept and ranked at query time
+    try:
+        get_store(file_path).add(name, score, level, duration)  # duration dalam detik
+    except sqlite3.Error as e:
+        print(f"[ERROR] Failed to save score: {e}")